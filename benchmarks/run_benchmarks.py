@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Exel MCP tools.
+
+Every case (tool x mode x rows x columns x cell types) runs in a fresh
+process so its peak RSS is its own:
+
+- direct: the worker imports src/main.py and calls the tool function
+- http:   the worker starts the server (src/main.py) and calls the tool
+          through an MCP client; peak RSS is the server's
+
+Input workbooks and CSV files are generated before the clock starts; only
+the tool call itself (plus a flush for tools whose saves are deferred by the
+workbook cache) is timed. Results are written as JSON and compared with a
+stored baseline; the script exits with status 1 when a case is slower or
+uses more memory than the baseline by more than the threshold.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --rows 1000,100000,1000000 --cols 5,100
+    python benchmarks/run_benchmarks.py --mode http --tools create,export
+    python benchmarks/run_benchmarks.py --update-baseline
+"""
+
+import argparse
+import asyncio
+import csv
+import importlib
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = REPO_ROOT / "src"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+# Untracked run output (ignored by git)
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results" / "benchmark_results.json"
+
+TOOLS = ("create", "info", "chart", "format", "import", "export")
+MODES = ("direct", "http")
+CELL_TYPES = ("mixed", "numeric", "text")
+
+# Timing differences below this many seconds are treated as noise
+MIN_TIME_DELTA = 0.05
+# Memory differences below this many MB are treated as noise
+MIN_RSS_DELTA_MB = 10.0
+
+
+# ---------------------------------------------------------------------------
+# Input generation
+
+
+def make_headers(cols: int) -> List[str]:
+    return [f"Column {i + 1}" for i in range(cols)]
+
+
+def make_rows(rows: int, cols: int, cell_types: str) -> List[List[Any]]:
+    """Deterministic rows of the requested cell types."""
+    rng = random.Random(rows * 1000 + cols)
+    start = date(2024, 1, 1)
+
+    def cell(col: int) -> Any:
+        kind = cell_types
+        if kind == "mixed":
+            kind = ("int", "float", "text", "date", "bool")[col % 5]
+        if kind in ("numeric", "int"):
+            return rng.randint(0, 1_000_000) if col % 2 == 0 else rng.random() * 1000
+        if kind == "float":
+            return round(rng.random() * 1000, 2)
+        if kind == "date":
+            return start + timedelta(days=rng.randint(0, 3650))
+        if kind == "bool":
+            return rng.random() < 0.5
+        return f"item-{rng.randint(0, 99999)}"
+
+    return [[cell(col) for col in range(cols)] for _ in range(rows)]
+
+
+def write_source_workbook(path: Path, rows: int, cols: int, cell_types: str) -> None:
+    """Write the input workbook for info/chart/format/export cases."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    ws.append(make_headers(cols))
+    for row in make_rows(rows, cols, cell_types):
+        ws.append(row)
+    wb.save(path)
+
+
+def write_source_csv(path: Path, rows: int, cols: int, cell_types: str) -> None:
+    """Write the input CSV for import cases."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(make_headers(cols))
+        for row in make_rows(rows, cols, cell_types):
+            writer.writerow([v.isoformat() if isinstance(v, date) else v for v in row])
+
+
+def column_letter(index: int) -> str:
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def tool_call(
+    tool: str, rows: int, cols: int, cell_types: str, out_dir: Path
+) -> Tuple[str, Dict[str, Any], List[str], str]:
+    """
+    Prepare inputs for one case.
+
+    Returns:
+        (MCP tool name, arguments, tools to call afterwards inside the timed
+        section, output file name)
+    """
+    last = f"{column_letter(cols)}{rows + 1}"
+    if tool == "create":
+        data = [
+            [v.isoformat() if isinstance(v, date) else v for v in row]
+            for row in make_rows(rows, cols, cell_types)
+        ]
+        args = {
+            "filename": "created.xlsx",
+            "headers": make_headers(cols),
+            "sheet_data": data,
+            "formatting": {"header_bold": True, "auto_width": True},
+        }
+        return "create_excel_file", args, [], "created.xlsx"
+
+    if tool == "import":
+        write_source_csv(out_dir / "source.csv", rows, cols, cell_types)
+        args = {"csv_file": str(out_dir / "source.csv"), "excel_file": "imported.xlsx"}
+        return "import_csv_to_excel", args, [], "imported.xlsx"
+
+    write_source_workbook(out_dir / "source.xlsx", rows, cols, cell_types)
+    if tool == "info":
+        return "get_excel_info", {"filename": "source.xlsx"}, [], "source.xlsx"
+    if tool == "chart":
+        args = {
+            "filename": "source.xlsx",
+            "chart_type": "bar",
+            "data_range": f"A1:{last}",
+        }
+        return "create_excel_chart", args, ["flush_excel_changes"], "source.xlsx"
+    if tool == "format":
+        args = {
+            "filename": "source.xlsx",
+            "cell_range": f"A1:{last}",
+            "formatting": {"bold": True, "background_color": "FFFF00", "border": True},
+        }
+        return "format_excel_cells", args, ["flush_excel_changes"], "source.xlsx"
+    if tool == "export":
+        args = {"excel_file": "source.xlsx", "csv_file": str(out_dir / "export.csv")}
+        return "export_excel_to_csv", args, [], "export.csv"
+    raise ValueError(f"Unknown tool: {tool}")
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+
+
+def self_peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def process_peak_rss_mb(pid: int) -> Optional[float]:
+    """Peak RSS of another process (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# The server imports openpyxl on first use. Load it before the clock starts,
+# so cases measure the tool and not a one-off import (startup_benchmark.py
+# covers cold start).
+OPENPYXL_MODULES = (
+    "openpyxl",
+    "openpyxl.cell",
+    "openpyxl.chart",
+    "openpyxl.styles",
+    "openpyxl.styles.cell_style",
+    "openpyxl.utils",
+)
+# Untimed HTTP calls that make the server import the same modules
+WARMUP_CALLS = (
+    (
+        "create_excel_file",
+        {
+            "filename": "warmup.xlsx",
+            "headers": ["A", "B"],
+            "sheet_data": [["a", 1]],
+            "formatting": {"header_bold": True},
+        },
+    ),
+    (
+        "create_excel_chart",
+        {"filename": "warmup.xlsx", "chart_type": "bar", "data_range": "A1:B2"},
+    ),
+    (
+        "format_excel_cells",
+        {"filename": "warmup.xlsx", "cell_range": "A1", "formatting": {"bold": True}},
+    ),
+    ("flush_excel_changes", {}),
+)
+
+
+def run_direct(case: Dict[str, Any], out_dir: Path) -> Dict[str, Any]:
+    os.environ["OUTPUT_DIR"] = str(out_dir)
+    sys.path.insert(0, str(SRC_DIR))
+    import main
+
+    for module in OPENPYXL_MODULES:
+        importlib.import_module(module)
+
+    name, args, followups, output = tool_call(
+        case["tool"], case["rows"], case["cols"], case["cell_types"], out_dir
+    )
+
+    def call(tool_name: str, **kwargs: Any) -> Any:
+        tool = getattr(main, tool_name)
+        return asyncio.run(getattr(tool, "fn", tool)(**kwargs))
+
+    start = time.perf_counter()
+    result = call(name, **args)
+    for followup in followups:
+        call(followup)
+    seconds = time.perf_counter() - start
+
+    if isinstance(result, dict) and "error" in result:
+        raise RuntimeError(result["error"])
+    return {
+        "seconds": round(seconds, 4),
+        "peak_rss_mb": self_peak_rss_mb(),
+        "output_bytes": (out_dir / output).stat().st_size,
+    }
+
+
+def run_http(case: Dict[str, Any], out_dir: Path) -> Dict[str, Any]:
+    from fastmcp import Client
+
+    port = free_port()
+    env = dict(
+        os.environ,
+        HOST="127.0.0.1",
+        PORT=str(port),
+        FILE_SERVER_PORT=str(free_port()),
+        OUTPUT_DIR=str(out_dir),
+    )
+    server = subprocess.Popen(
+        [sys.executable, str(SRC_DIR / "main.py")],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("Server did not start")
+                time.sleep(0.1)
+
+        name, args, followups, output = tool_call(
+            case["tool"], case["rows"], case["cols"], case["cell_types"], out_dir
+        )
+
+        async def call() -> float:
+            async with Client(f"http://127.0.0.1:{port}/mcp", timeout=3600) as client:
+                for warmup, warmup_args in WARMUP_CALLS:
+                    await client.call_tool(warmup, warmup_args)
+                start = time.perf_counter()
+                result = await client.call_tool(name, args)
+                for followup in followups:
+                    await client.call_tool(followup, {})
+                seconds = time.perf_counter() - start
+                if isinstance(result.data, dict) and "error" in result.data:
+                    raise RuntimeError(result.data["error"])
+                return seconds
+
+        seconds = asyncio.run(call())
+        return {
+            "seconds": round(seconds, 4),
+            "peak_rss_mb": process_peak_rss_mb(server.pid),
+            "output_bytes": (out_dir / output).stat().st_size,
+        }
+    finally:
+        server.terminate()
+        server.wait(10)
+
+
+def run_case_worker(case: Dict[str, Any]) -> None:
+    """Entry point of the per-case subprocess; prints one JSON result."""
+    with tempfile.TemporaryDirectory(prefix="excel-bench-") as tmp:
+        try:
+            runner = run_direct if case["mode"] == "direct" else run_http
+            result = {**case, **runner(case, Path(tmp)), "ok": True}
+        except Exception as e:
+            result = {**case, "ok": False, "error": str(e)}
+    print(json.dumps(result), flush=True)
+
+
+def run_case(case: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+    try:
+        proc = subprocess.run(
+            [sys.executable, __file__, "--case", json.dumps(case)],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {**case, "ok": False, "error": f"timed out after {timeout}s"}
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        error = proc.stderr.strip().splitlines()[-1:] or ["no output"]
+        return {**case, "ok": False, "error": error[0]}
+    return json.loads(lines[-1])
+
+
+def best_of(case: Dict[str, Any], repeat: int, timeout: float) -> Dict[str, Any]:
+    """Run a case ``repeat`` times; keep the fastest time and the highest RSS."""
+    runs = [run_case(case, timeout) for _ in range(max(repeat, 1))]
+    ok = [r for r in runs if r["ok"]]
+    if len(ok) < len(runs):
+        return next(r for r in runs if not r["ok"])
+    best = min(ok, key=lambda r: r["seconds"])
+    peaks = [r["peak_rss_mb"] for r in ok if r["peak_rss_mb"] is not None]
+    return {**best, "peak_rss_mb": max(peaks) if peaks else None, "runs": len(ok)}
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+
+
+def case_key(result: Dict[str, Any]) -> Tuple:
+    return (
+        result["mode"],
+        result["tool"],
+        result["rows"],
+        result["cols"],
+        result["cell_types"],
+    )
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float
+) -> List[str]:
+    """Return a description of every case that regressed against the baseline."""
+    previous = {case_key(r): r for r in baseline if r.get("ok")}
+    regressions = []
+    for result in results:
+        base = previous.get(case_key(result))
+        if base is None:
+            continue
+        label = "{}/{} rows={} cols={} types={}".format(*case_key(result)[:5])
+        if not result.get("ok"):
+            regressions.append(f"{label}: failed ({result.get('error')})")
+            continue
+        seconds, base_seconds = result["seconds"], base["seconds"]
+        if (
+            seconds > base_seconds * (1 + threshold)
+            and seconds - base_seconds > MIN_TIME_DELTA
+        ):
+            regressions.append(f"{label}: {base_seconds:.3f}s -> {seconds:.3f}s")
+        rss, base_rss = result.get("peak_rss_mb"), base.get("peak_rss_mb")
+        if (
+            rss is not None
+            and base_rss is not None
+            and rss > base_rss * (1 + threshold)
+            and rss - base_rss > MIN_RSS_DELTA_MB
+        ):
+            regressions.append(f"{label}: peak RSS {base_rss} MB -> {rss} MB")
+    return regressions
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_list(value: str, cast=str) -> List[Any]:
+    return [cast(item.strip()) for item in value.split(",") if item.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Exel MCP tools")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--tools", default=",".join(TOOLS))
+    parser.add_argument("--mode", default="direct", choices=(*MODES, "both"))
+    parser.add_argument("--rows", default="1000,10000")
+    parser.add_argument("--cols", default="5,20")
+    parser.add_argument("--types", default="mixed", help=",".join(CELL_TYPES))
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT))
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown / memory growth over the baseline (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=1800, help="Seconds allowed per case"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Run each case this many times and keep the fastest",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Merge these results into the baseline instead of comparing",
+    )
+    args = parser.parse_args()
+
+    if args.case:
+        run_case_worker(json.loads(args.case))
+        return 0
+
+    tools = parse_list(args.tools)
+    cell_types = parse_list(args.types)
+    for name, values, allowed in (
+        ("tool", tools, TOOLS),
+        ("cell type", cell_types, CELL_TYPES),
+    ):
+        unknown = set(values) - set(allowed)
+        if unknown:
+            parser.error(f"Unknown {name}: {', '.join(sorted(unknown))}")
+    modes = MODES if args.mode == "both" else (args.mode,)
+
+    results = []
+    for mode, tool, rows, cols, types in itertools.product(
+        modes, tools, parse_list(args.rows, int), parse_list(args.cols, int), cell_types
+    ):
+        case = {"mode": mode, "tool": tool, "rows": rows, "cols": cols}
+        case["cell_types"] = types
+        result = best_of(case, args.repeat, args.timeout)
+        results.append(result)
+        if result["ok"]:
+            print(
+                f"{mode:6} {tool:7} rows={rows:<8} cols={cols:<4} {types:8} "
+                f"{result['seconds']:8.3f}s  {result['peak_rss_mb']} MB  "
+                f"{result['output_bytes']} bytes"
+            )
+        else:
+            print(
+                f"{mode:6} {tool:7} rows={rows:<8} cols={cols:<4} {types:8} FAILED: "
+                f"{result['error']}"
+            )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nResults written to {args.output}")
+
+    baseline_path = Path(args.baseline)
+    baseline = (
+        json.loads(baseline_path.read_text())["results"]
+        if baseline_path.exists()
+        else []
+    )
+
+    if args.update_baseline:
+        merged = {case_key(r): r for r in baseline}
+        merged.update({case_key(r): r for r in results if r["ok"]})
+        report["results"] = sorted(merged.values(), key=case_key)
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline updated: {baseline_path}")
+        return 0 if all(r["ok"] for r in results) else 1
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {baseline_path}:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    failed = [r for r in results if not r["ok"]]
+    print(f"\nNo regressions against {baseline_path}" if baseline else "")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
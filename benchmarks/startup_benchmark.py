@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the Exel MCP server.
+
+Measures, in fresh processes:
+
+- import: time to ``import main`` (the tool module) in a new interpreter
+- ready: time from launching ``src/main.py`` until the MCP port accepts
+  connections
+- first_download: first request to the file server
+- first_info: first get_excel_info call (MCP session setup included)
+- first_create: first create_excel_file call, which loads openpyxl
+
+Each measurement is repeated ``--runs`` times and the median is reported.
+With ``--budget-import``/``--budget-ready`` the script exits with status 1
+when the median exceeds the budget, so it can guard cold-start time in CI.
+
+Usage:
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --runs 10 --budget-import 2.0
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+from run_benchmarks import SRC_DIR, free_port, write_source_workbook
+
+IMPORT_SNIPPET = (
+    "import time, sys; start = time.perf_counter(); import main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def measure_import() -> float:
+    """Seconds to import main in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", IMPORT_SNIPPET],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def wait_for_port(port: int, server: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            if server.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("Server did not start")
+            time.sleep(0.005)
+
+
+def measure_server() -> Dict[str, float]:
+    """Launch the server and time readiness and the first requests."""
+    from fastmcp import Client
+
+    port, file_port = free_port(), free_port()
+    with tempfile.TemporaryDirectory(prefix="excel-startup-") as tmp:
+        write_source_workbook(Path(tmp) / "source.xlsx", 100, 5, "mixed")
+        env = dict(
+            os.environ,
+            HOST="127.0.0.1",
+            PORT=str(port),
+            FILE_SERVER_PORT=str(file_port),
+            OUTPUT_DIR=tmp,
+        )
+        start = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, "-W", "ignore", str(SRC_DIR / "main.py")],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_port(port, server)
+            timings = {"ready": time.perf_counter() - start}
+            wait_for_port(file_port, server)
+
+            begin = time.perf_counter()
+            url = f"http://127.0.0.1:{file_port}/files/source.xlsx"
+            with urllib.request.urlopen(url) as response:
+                response.read()
+            timings["first_download"] = time.perf_counter() - begin
+
+            async def calls() -> None:
+                begin = time.perf_counter()
+                async with Client(f"http://127.0.0.1:{port}/mcp") as client:
+                    await client.call_tool(
+                        "get_excel_info", {"filename": "source.xlsx"}
+                    )
+                    timings["first_info"] = time.perf_counter() - begin
+
+                    begin = time.perf_counter()
+                    await client.call_tool(
+                        "create_excel_file",
+                        {
+                            "filename": "created.xlsx",
+                            "headers": ["A", "B"],
+                            "sheet_data": [[1, 2]],
+                        },
+                    )
+                    timings["first_create"] = time.perf_counter() - begin
+
+            asyncio.run(calls())
+            return timings
+        finally:
+            server.terminate()
+            server.wait(10)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure Exel MCP cold start")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument(
+        "--budget-import", type=float, help="Maximum median import seconds"
+    )
+    parser.add_argument(
+        "--budget-ready", type=float, help="Maximum median seconds until ready"
+    )
+    args = parser.parse_args()
+
+    samples: Dict[str, List[float]] = {}
+    for _ in range(args.runs):
+        samples.setdefault("import", []).append(measure_import())
+    for _ in range(args.runs):
+        for name, seconds in measure_server().items():
+            samples.setdefault(name, []).append(seconds)
+
+    results = {
+        name: {
+            "median": round(statistics.median(values), 4),
+            "min": round(min(values), 4),
+            "max": round(max(values), 4),
+        }
+        for name, values in samples.items()
+    }
+    for name, result in results.items():
+        print(
+            f"{name:15} median {result['median']:.3f}s  "
+            f"(min {result['min']:.3f}s, max {result['max']:.3f}s)"
+        )
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+
+    failed = False
+    for name, budget in (("import", args.budget_import), ("ready", args.budget_ready)):
+        if budget is not None and results[name]["median"] > budget:
+            print(f"{name} median {results[name]['median']:.3f}s exceeds {budget}s")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
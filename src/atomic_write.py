@@ -0,0 +1,69 @@
+"""
+Atomic file replacement.
+
+Output files are written to a temporary file in the same directory and then
+moved over the destination with ``os.replace``, which is atomic on POSIX and
+Windows. A reader (a download, get_excel_info, an export) therefore sees
+either the previous complete file or the new complete file, never a
+partially written one, and an open download keeps streaming the version it
+started with.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager, suppress
+from typing import Iterator
+
+# Permissions a plain open() would give a new file; mkstemp always uses 0600
+_umask = os.umask(0)
+os.umask(_umask)
+DEFAULT_FILE_MODE = 0o666 & ~_umask
+
+
+def _fsync_directory(directory: str) -> None:
+    """Persist a rename by syncing its directory (not supported on Windows)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_path(path: str, fsync: bool = False) -> Iterator[str]:
+    """
+    Yield a temporary path to write instead of ``path``.
+
+    When the block exits normally the temporary file is moved over ``path``;
+    if it raises, the temporary file is removed and ``path`` is untouched.
+
+    Args:
+        path: Destination file
+        fsync: Flush the file and the directory entry to disk before
+            returning, so the new content survives a power loss
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+    )
+    os.close(fd)
+    try:
+        yield tmp_path
+
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = DEFAULT_FILE_MODE
+        os.chmod(tmp_path, mode)
+        if fsync:
+            with open(tmp_path, "rb+") as f:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        if fsync:
+            _fsync_directory(directory)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
@@ -0,0 +1,215 @@
+"""
+A1 reference parsing and resolution.
+
+Accepted forms, each optionally prefixed with a sheet name (quoted with
+single quotes when it contains spaces or punctuation) and with ``$``
+anchors, which are ignored:
+
+- ``B2``                   a single cell
+- ``A1:C10``               a range of cells (corners in any order)
+- ``A:C``                  whole columns
+- ``1:5``                  whole rows
+- ``'Q1 Sales'!A1:D10``    a range on another sheet
+- ``Revenue``              a defined name (sheet or workbook scope)
+
+``parse_reference`` turns text into a ``RangeRef`` and is memoized, since
+tools are called over and over with the same few ranges. ``resolve_range``
+also looks up the sheet and defined names, and bounds whole rows and
+columns to the sheet's used range, so callers never iterate up to Excel's
+row and column limits.
+
+Column letters come from a table computed once for all 16,384 columns.
+This module does not import openpyxl; worksheets and workbooks are used
+through the attributes openpyxl gives them.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+# Excel's grid limits
+MAX_ROW = 1048576
+MAX_COLUMN = 16384
+REFERENCE_CACHE_SIZE = 1024
+
+
+def _build_column_letters() -> Tuple[str, ...]:
+    single = [chr(code) for code in range(ord("A"), ord("Z") + 1)]
+    double = [a + b for a in single for b in single]
+    triple = [a + b for a in single for b in double]
+    # Index 0 is unused so that COLUMN_LETTERS[1] == "A"
+    return ("",) + tuple(single + double + triple)[:MAX_COLUMN]
+
+
+COLUMN_LETTERS = _build_column_letters()
+COLUMN_INDEX: Dict[str, int] = {
+    letters: index for index, letters in enumerate(COLUMN_LETTERS) if index
+}
+
+# Unquoted sheet and defined names may use any Unicode letters (\w)
+_SHEET = r"(?:'(?P<quoted>(?:[^']|'')+)'|(?P<sheet>[\w.]+))!"
+
+
+def _col(name: str) -> str:
+    return rf"\$?(?P<{name}>[A-Za-z]{{1,3}})"
+
+
+def _row_number(name: str) -> str:
+    return rf"\$?(?P<{name}>[0-9]+)"
+
+
+_REFERENCE = re.compile(
+    rf"^(?:{_SHEET})?(?:"
+    rf"{_col('col1')}{_row_number('row1')}(?::{_col('col2')}{_row_number('row2')})?"
+    rf"|{_col('first_col')}:{_col('last_col')}"
+    rf"|{_row_number('first_row')}:{_row_number('last_row')}"
+    r"|(?P<name>(?:[^\W\d]|\\)[\w.\\]*)"
+    r")$"
+)
+_CELL = re.compile(rf"^{_col('col')}{_row_number('row')}$")
+
+
+class RangeRef(NamedTuple):
+    """
+    A parsed reference. Row or column bounds are None for whole columns or
+    whole rows; for a defined name only ``name`` (and ``sheet`` when the
+    name is sheet-qualified) is set.
+    """
+
+    sheet: Optional[str]
+    min_row: Optional[int]
+    max_row: Optional[int]
+    min_col: Optional[int]
+    max_col: Optional[int]
+    name: Optional[str] = None
+
+
+def column_index(letters: str) -> int:
+    """Convert column letters to a 1-based index ("A" -> 1, "AA" -> 27)."""
+    try:
+        return COLUMN_INDEX[letters.upper()]
+    except KeyError:
+        raise ValueError(f"Invalid column: {letters}") from None
+
+
+def column_letter(index: int) -> str:
+    """Convert a 1-based column index to letters (27 -> "AA")."""
+    if not 1 <= index <= MAX_COLUMN:
+        raise ValueError(f"Column index out of range: {index}")
+    return COLUMN_LETTERS[index]
+
+
+def _row(text: str) -> int:
+    row = int(text)
+    if not 1 <= row <= MAX_ROW:
+        raise ValueError(f"Row out of range: {row}")
+    return row
+
+
+def cell_coordinate(text: str) -> Tuple[int, int]:
+    """Parse a single cell reference such as "B12" into (row, column)."""
+    match = _CELL.match(text.strip())
+    if not match:
+        raise ValueError(f"Invalid cell reference: {text}")
+    return _row(match.group("row")), column_index(match.group("col"))
+
+
+@lru_cache(maxsize=REFERENCE_CACHE_SIZE)
+def parse_reference(text: str) -> RangeRef:
+    """
+    Parse an A1 reference (see the module docstring for the accepted forms).
+
+    Raises:
+        ValueError: If ``text`` is not a valid reference
+    """
+    match = _REFERENCE.match(text.strip())
+    if not match:
+        raise ValueError(f"Invalid cell reference: {text}")
+
+    sheet = match.group("sheet")
+    if match.group("quoted") is not None:
+        sheet = match.group("quoted").replace("''", "'")
+
+    if match.group("name"):
+        return RangeRef(sheet, None, None, None, None, match.group("name"))
+
+    if match.group("col1"):
+        col1, row1, col2, row2 = match.group("col1", "row1", "col2", "row2")
+        if col2 is None:
+            col2, row2 = col1, row1
+        rows = sorted((_row(row1), _row(row2)))
+        cols = sorted((column_index(col1), column_index(col2)))
+        return RangeRef(sheet, rows[0], rows[1], cols[0], cols[1])
+
+    if match.group("first_col"):
+        cols = match.group("first_col", "last_col")
+        cols = sorted(column_index(letters) for letters in cols)
+        return RangeRef(sheet, None, None, cols[0], cols[1])
+
+    rows = sorted(_row(number) for number in match.group("first_row", "last_row"))
+    return RangeRef(sheet, rows[0], rows[1], None, None)
+
+
+def _find_defined_name(names: Any, name: str) -> Any:
+    """Look a name up in a defined-name mapping; names are case-insensitive."""
+    if name in names:
+        return names[name]
+    folded = name.casefold()
+    for key, value in names.items():
+        if key.casefold() == folded:
+            return value
+    return None
+
+
+def _worksheet(wb: Any, sheet: str) -> Any:
+    if sheet not in wb.sheetnames:
+        raise ValueError(f"Worksheet not found: {sheet}")
+    return wb[sheet]
+
+
+def _resolve_name(wb: Any, ref: RangeRef, ws: Any) -> RangeRef:
+    """Look up a defined name, sheet-scoped on ``ws`` first, then workbook."""
+    defined = _find_defined_name(ws.defined_names, ref.name)
+    if defined is None:
+        defined = _find_defined_name(wb.defined_names, ref.name)
+    if defined is None:
+        raise ValueError(f"Unknown defined name: {ref.name}")
+
+    try:
+        destinations = list(defined.destinations)
+    except Exception:
+        destinations = []
+    if len(destinations) != 1:
+        raise ValueError(f"Defined name {ref.name} does not refer to a single range")
+    sheet, coordinate = destinations[0]
+    target = parse_reference(coordinate)
+    if target.name is not None:
+        raise ValueError(f"Defined name {ref.name} does not refer to a range")
+    return target._replace(sheet=sheet)
+
+
+def resolve_range(ws: Any, text: str) -> Tuple[Any, RangeRef]:
+    """
+    Resolve ``text`` against worksheet ``ws`` (used when the reference names
+    no sheet).
+
+    Returns:
+        The worksheet the range is on and a RangeRef with every bound set.
+        Whole rows and columns are limited to the sheet's used range.
+
+    Raises:
+        ValueError: If the reference, its sheet or its defined name is invalid
+    """
+    ref = parse_reference(text)
+    wb = ws.parent
+    if ref.sheet is not None:
+        ws = _worksheet(wb, ref.sheet)
+    if ref.name is not None:
+        ref = _resolve_name(wb, ref, ws)
+        ws = _worksheet(wb, ref.sheet)
+
+    if ref.min_row is None:
+        ref = ref._replace(min_row=ws.min_row, max_row=ws.max_row)
+    if ref.min_col is None:
+        ref = ref._replace(min_col=ws.min_column, max_col=ws.max_column)
+    return ws, ref
@@ -0,0 +1,291 @@
+"""
+Worksheet to CSV export.
+
+Several sheets are exported in parallel on a process pool. Each worker opens
+the workbook read-only on its own and streams one sheet, so no parsed state
+is shared. The pool is created on first use and kept for the life of the
+process.
+
+Workers are forked from a forkserver that has preloaded this module and
+openpyxl, so starting one is cheap. multiprocessing would still re-run the
+parent's ``__main__`` script in every worker. For the server that means
+importing fastmcp and building the whole app, so the server calls
+``skip_main_in_workers`` at startup. Workers then import only this module
+and openpyxl.
+
+openpyxl and the process pool are imported on first use: the file server
+imports this module for ``fresh_gzip_sidecar`` and should not pay for them.
+"""
+
+import csv
+import gzip
+import io
+import re
+import sys
+import threading
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, TextIO
+
+from atomic_write import atomic_path
+
+# Fast level: CSV compresses 5-10x even at low levels
+GZIP_LEVEL = 6
+
+# Modules every export worker needs, imported once in the forkserver
+WORKER_PRELOAD = ["csv_export", "openpyxl"]
+
+_pool: Any = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+class _TeeWriter:
+    """Text sink that writes every chunk to several files."""
+
+    def __init__(self, *files: TextIO) -> None:
+        self.files = files
+
+    def write(self, text: str) -> int:
+        for f in self.files:
+            f.write(text)
+        return len(text)
+
+
+def write_sheet_to_csv(
+    ws,
+    csv_file: str,
+    delimiter: str = ",",
+    include_headers: bool = True,
+    precompress: bool = False,
+) -> int:
+    """
+    Write a worksheet to a CSV file one row at a time.
+
+    Rows are written as ``iter_rows`` yields them, so memory stays constant
+    when ``ws`` comes from a read-only workbook. With ``precompress`` a gzip
+    copy (``<csv_file>.gz``) is written in the same pass for the download
+    server to send to clients that accept gzip. Both files are written to
+    temporary files and renamed into place when complete.
+
+    Returns:
+        Number of rows written
+    """
+    rows = ws.iter_rows(values_only=True)
+    first_row = next(rows, None)
+    if first_row is None:
+        raise ValueError("Worksheet is empty")
+
+    # Create output directory if needed
+    output_dir = Path(csv_file).parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    row_count = 0
+    with ExitStack() as stack:
+        # Open the .gz first so it is closed (and last modified) after the
+        # CSV; the server treats an older .gz as stale
+        outputs: List[TextIO] = []
+        if precompress:
+            gz_path = stack.enter_context(atomic_path(f"{csv_file}.gz"))
+            gz = gzip.open(gz_path, "wb", compresslevel=GZIP_LEVEL)
+            outputs.append(
+                stack.enter_context(io.TextIOWrapper(gz, "utf-8", newline=""))
+            )
+        tmp_path = stack.enter_context(atomic_path(csv_file))
+        outputs.insert(
+            0, stack.enter_context(open(tmp_path, "w", newline="", encoding="utf-8"))
+        )
+        csv_writer = csv.writer(_TeeWriter(*outputs), delimiter=delimiter)
+
+        # The first row holds the headers
+        if include_headers:
+            csv_writer.writerow(["" if cell is None else cell for cell in first_row])
+            row_count += 1
+
+        for row in rows:
+            # Convert None to empty string
+            csv_writer.writerow(["" if cell is None else cell for cell in row])
+            row_count += 1
+
+    return row_count
+
+
+def fresh_gzip_sidecar(path: Path) -> Optional[Path]:
+    """Return ``<path>.gz`` if it exists and is not older than ``path``."""
+    sidecar = path.with_name(path.name + ".gz")
+    try:
+        return (
+            sidecar if sidecar.stat().st_mtime_ns >= path.stat().st_mtime_ns else None
+        )
+    except FileNotFoundError:
+        return None
+
+
+def export_sheet(
+    excel_file: str,
+    sheet_name: str,
+    csv_file: str,
+    delimiter: str = ",",
+    include_headers: bool = True,
+    precompress: bool = False,
+) -> Dict[str, Any]:
+    """
+    Export one sheet of ``excel_file`` to ``csv_file`` (process-pool worker).
+
+    Returns:
+        Dictionary with the sheet name, CSV path, row count and elapsed seconds
+    """
+    from openpyxl import load_workbook
+
+    start = time.perf_counter()
+    wb = load_workbook(excel_file, read_only=True)
+    try:
+        rows = write_sheet_to_csv(
+            wb[sheet_name], csv_file, delimiter, include_headers, precompress
+        )
+    finally:
+        wb.close()
+
+    return {
+        "sheet": sheet_name,
+        "csv_file": csv_file,
+        "rows": rows,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def sheet_csv_paths(csv_file: str, sheet_names: Sequence[str]) -> List[str]:
+    """Derive one CSV path per sheet (report.csv -> report_Sales.csv)."""
+    base = Path(csv_file)
+    suffix = base.suffix or ".csv"
+    paths: List[str] = []
+    for sheet_name in sheet_names:
+        safe_name = re.sub(r"[^A-Za-z0-9_-]+", "_", sheet_name).strip("_") or "sheet"
+        path = str(base.with_name(f"{base.stem}_{safe_name}{suffix}"))
+        candidate, n = path, 2
+        while candidate in paths:
+            candidate = str(base.with_name(f"{base.stem}_{safe_name}_{n}{suffix}"))
+            n += 1
+        paths.append(candidate)
+    return paths
+
+
+def skip_main_in_workers() -> None:
+    """
+    Stop pool workers from re-running the ``__main__`` script.
+
+    For a script run as ``python script.py``, multiprocessing re-executes the
+    script (as ``__mp_main__``) in every worker it starts, so that objects
+    defined in it can be unpickled. Export workers only run functions from
+    this module. multiprocessing does not re-run a main module whose spec is
+    named "__main__" (as for a package's ``__main__.py``), so one is set.
+    """
+    import importlib.machinery
+
+    main = sys.modules["__main__"]
+    if getattr(main, "__spec__", None) is None:
+        main.__spec__ = importlib.machinery.ModuleSpec("__main__", None)
+
+
+def _get_pool(workers: int) -> Any:
+    """
+    Return the shared export pool, growing it to ``workers`` if needed.
+
+    The caller must hold ``_pool_lock`` until it has submitted its work, so
+    the pool cannot be replaced in between.
+    """
+    global _pool, _pool_workers
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if _pool is None or _pool_workers < workers:
+        if _pool is not None:
+            # Work already submitted to the old pool still completes
+            _pool.shutdown(wait=False)
+        # Forking the server directly is unsafe because it runs other
+        # threads; the forkserver is a clean single-threaded process
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(WORKER_PRELOAD)
+        else:
+            context = multiprocessing.get_context("spawn")
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        _pool_workers = workers
+    return _pool
+
+
+def _discard_pool(pool: Any) -> None:
+    """Forget ``pool`` (e.g. after a worker died) so the next call starts anew."""
+    global _pool, _pool_workers
+
+    with _pool_lock:
+        if _pool is pool:
+            _pool, _pool_workers = None, 0
+    pool.shutdown(wait=False)
+
+
+def shutdown_pool() -> None:
+    """Stop the export workers, if any were started."""
+    global _pool, _pool_workers
+
+    with _pool_lock:
+        pool, _pool, _pool_workers = _pool, None, 0
+    if pool is not None:
+        pool.shutdown()
+
+
+def export_sheets(
+    excel_file: str,
+    sheet_names: Sequence[str],
+    csv_files: Sequence[str],
+    delimiter: str = ",",
+    include_headers: bool = True,
+    max_workers: int = 1,
+    precompress: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Export several sheets to CSV in parallel on the shared process pool.
+
+    The pool is grown to ``max_workers`` if it is smaller; a larger pool is
+    kept as is. A single sheet (or ``max_workers`` of 1) is exported
+    in-process.
+
+    Returns:
+        Per-sheet results from ``export_sheet``, in ``sheet_names`` order
+    """
+    from concurrent.futures.process import BrokenProcessPool
+
+    jobs = list(zip(sheet_names, csv_files))
+    workers = max(1, min(max_workers, len(jobs)))
+
+    if workers == 1:
+        return [
+            export_sheet(
+                excel_file, sheet, path, delimiter, include_headers, precompress
+            )
+            for sheet, path in jobs
+        ]
+
+    pool = None
+    try:
+        with _pool_lock:
+            pool = _get_pool(workers)
+            futures = [
+                pool.submit(
+                    export_sheet,
+                    excel_file,
+                    sheet,
+                    path,
+                    delimiter,
+                    include_headers,
+                    precompress,
+                )
+                for sheet, path in jobs
+            ]
+        return [future.result() for future in futures]
+    except BrokenProcessPool:
+        if pool is not None:
+            _discard_pool(pool)
+        raise
@@ -0,0 +1,195 @@
+"""
+Background jobs for long-running tools.
+
+Tools called with ``async=true`` hand their work to a JobManager and return a
+job id straight away instead of holding the JSON-RPC request open. Jobs run
+on a fixed-size thread pool; their status, progress counters and result are
+kept in memory so clients can poll them, and a bounded number of finished
+jobs is retained for later lookups.
+
+Cancellation is cooperative: ``cancel`` stops a queued job outright, and a
+running job stops the next time it reports progress.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = {SUCCEEDED, FAILED, CANCELLED}
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been asked to stop."""
+
+
+class Job:
+    """State of one background job."""
+
+    def __init__(self, tool: str, output: Optional[str] = None) -> None:
+        self.id = uuid.uuid4().hex
+        self.tool = tool
+        self.output = output
+        self.status = QUEUED
+        self.progress: Dict[str, int] = {}
+        self.result: Optional[str] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.future: Optional[Future] = None
+        self._cancel = threading.Event()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def report(self, check_cancel: bool = True, **progress: int) -> None:
+        """
+        Update progress counters (e.g. ``rows``, ``bytes``).
+
+        Pass ``check_cancel=False`` for reports made once the job's output
+        has been written, when it is too late to stop.
+
+        Raises:
+            JobCancelled: If the job has been cancelled and ``check_cancel``
+        """
+        if check_cancel and self._cancel.is_set():
+            raise JobCancelled(f"Job {self.id} was cancelled")
+        self.progress.update(progress)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the job's state as a JSON-serializable dictionary."""
+        end = self.finished_at or time.time()
+        return {
+            "job_id": self.id,
+            "tool": self.tool,
+            "status": self.status,
+            "progress": dict(self.progress),
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_seconds": (
+                round(end - self.started_at, 3) if self.started_at else 0.0
+            ),
+        }
+
+
+class JobManager:
+    """
+    Run jobs on a bounded thread pool and keep their state for polling.
+
+    Args:
+        max_workers: Jobs that may run at the same time
+        max_pending: Jobs that may be queued or running before ``submit``
+            refuses new ones (their inputs are held in memory until they run)
+        max_finished: Finished jobs kept for status lookups; older ones are
+            forgotten first
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, max_finished: int) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="job"
+        )
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(
+        self, tool: str, fn: Callable[[Job], str], output: Optional[str] = None
+    ) -> Job:
+        """
+        Queue ``fn(job)`` and return the job; its return value becomes the
+        job's result.
+
+        Raises:
+            RuntimeError: If ``max_pending`` jobs are already queued or running
+        """
+        job = Job(tool, output)
+        with self._lock:
+            active = sum(
+                1 for j in self._jobs.values() if j.status not in FINISHED_STATES
+            )
+            if active >= self.max_pending:
+                raise RuntimeError(f"Too many pending jobs ({active}); try again later")
+            self._jobs[job.id] = job
+        job.future = self._pool.submit(self._run, job, fn)
+        logger.info(f"Queued job {job.id} ({tool})")
+        return job
+
+    def _run(self, job: Job, fn: Callable[[Job], str]) -> None:
+        if job.cancel_requested:
+            self._finish(job, CANCELLED)
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = fn(job)
+        except JobCancelled:
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, FAILED)
+        else:
+            self._finish(job, SUCCEEDED)
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.finished_at = time.time()
+        job.status = status
+        logger.info(f"Job {job.id} ({job.tool}) {status}")
+        with self._lock:
+            finished = [
+                j.id for j in self._jobs.values() if j.status in FINISHED_STATES
+            ]
+            for job_id in finished[: max(0, len(finished) - self.max_finished)]:
+                del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Job:
+        """
+        Look up a job by id.
+
+        Raises:
+            ValueError: If the job is unknown or has been forgotten
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise ValueError(f"Unknown job: {job_id}")
+        return job
+
+    def cancel(self, job_id: str) -> Job:
+        """Ask a job to stop; finished jobs are left unchanged."""
+        job = self.get(job_id)
+        if job.status not in FINISHED_STATES:
+            job._cancel.set()
+            if job.future is not None and job.future.cancel():
+                # Never started, so _run will not record the outcome
+                self._finish(job, CANCELLED)
+        return job
+
+    def stats(self) -> Dict[str, int]:
+        """Return job counts by status."""
+        with self._lock:
+            counts = {status: 0 for status in (QUEUED, RUNNING, *FINISHED_STATES)}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        counts["max_workers"] = self.max_workers
+        return counts
+
+    def shutdown(self) -> None:
+        """Cancel queued jobs and stop accepting new ones."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
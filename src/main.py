@@ -1,19 +1,65 @@
 import os
+import atexit
 import logging
-import re
 import json
-import csv
+import gzip
+import hmac
 import io
+import shutil
+from collections import Counter
+from datetime import date, time, timedelta
+from decimal import Decimal
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Dict,
+    Any,
+    Tuple,
+)
 from fastmcp import FastMCP
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from openpyxl.utils import get_column_letter
-from openpyxl.chart import BarChart, LineChart, PieChart, ScatterChart, Reference
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from pydantic import Field
+from concurrent.futures import ThreadPoolExecutor
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 import threading
 import urllib.parse
+import zipfile
+import xml.etree.ElementTree as ET
+from email.utils import formatdate, parsedate_to_datetime
+from xlsx_metadata import MetadataCache, read_workbook_metadata
+from workbook_cache import WorkbookCache
+from path_locks import PathLockManager
+from atomic_write import atomic_path
+from metrics import MetricsRegistry, Sample
+from csv_export import (
+    export_sheets,
+    fresh_gzip_sidecar,
+    sheet_csv_paths,
+    shutdown_pool,
+    skip_main_in_workers,
+    write_sheet_to_csv,
+)
+from type_inference import typed_rows
+from jobs import SUCCEEDED, Job, JobManager
+from tool_executor import ToolExecutor, parse_limits
+from profiling import ToolProfiler
+from memory_inspector import MemoryInspector
+from cell_references import cell_coordinate, resolve_range
+
+# openpyxl (with its chart and style classes) is imported on first use, so
+# a process that only serves downloads or metadata never loads it
+if TYPE_CHECKING:
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Border, Font, PatternFill
 
 # Configure logging
 logging.basicConfig(
@@ -23,12 +69,189 @@ logger = logging.getLogger(__name__)
 
 # Configuration
 MAX_ROWS = int(os.getenv("MAX_ROWS", "10000"))
+MAX_STREAMING_ROWS = int(os.getenv("MAX_STREAMING_ROWS", "1048575"))
+STREAMING_THRESHOLD = int(os.getenv("STREAMING_THRESHOLD", "5000"))
+WIDTH_SAMPLE_ROWS = int(os.getenv("WIDTH_SAMPLE_ROWS", "1000"))
+MAX_COLUMN_WIDTH = 50
+STYLE_CACHE_SIZE = 256
+# Cell values openpyxl can write (datetime is a date subclass, bool an int)
+CELL_VALUE_TYPES = (str, int, float, Decimal, date, time, timedelta)
+
 MAX_COLS = int(os.getenv("MAX_COLS", "100"))
 MAX_FILENAME_LENGTH = int(os.getenv("MAX_FILENAME_LENGTH", "255"))
 ALLOWED_EXTENSIONS = {".xlsx", ".xls"}
 OUTPUT_DIR = os.getenv("OUTPUT_DIR", "./output")
+INFO_CACHE_SIZE = int(os.getenv("INFO_CACHE_SIZE", "128"))
+WORKBOOK_CACHE_MB = int(os.getenv("WORKBOOK_CACHE_MB", "256"))
+WORKBOOK_FLUSH_DELAY = float(os.getenv("WORKBOOK_FLUSH_DELAY", "2.0"))
+FILE_SERVER_WORKERS = int(os.getenv("FILE_SERVER_WORKERS", "8"))
+# Seconds a download connection may sit idle before it is dropped
+FILE_SERVER_TIMEOUT = float(os.getenv("FILE_SERVER_TIMEOUT", "30"))
+CSV_CHUNK_ROWS = int(os.getenv("CSV_CHUNK_ROWS", "10000"))
+EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", str(min(4, os.cpu_count() or 1))))
+CSV_PRECOMPRESS = os.getenv("CSV_PRECOMPRESS", "true").lower() in ("1", "true", "yes")
+# Download types worth compressing; .xlsx and .zip are already deflated
+COMPRESSIBLE_SUFFIXES = {".csv"}
+SAVE_FSYNC = os.getenv("SAVE_FSYNC", "false").lower() in ("1", "true", "yes")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "32"))
+JOB_HISTORY = int(os.getenv("JOB_HISTORY", "100"))
+TOOL_WORKERS = int(os.getenv("TOOL_WORKERS", "8"))
+# Workers only quick status tools may use; all other tools share the rest
+TOOL_RESERVED_WORKERS = int(os.getenv("TOOL_RESERVED_WORKERS", "2"))
+LIGHT_TOOLS = ("get_excel_info", "get_job_status", "cancel_job")
+# Calls of the heaviest tools allowed at once, so one kind of write cannot
+# take all shared workers; TOOL_CONCURRENCY="tool=n,..." overrides or extends
+TOOL_CONCURRENCY = {
+    "create_excel_file": 2,
+    "import_csv_to_excel": 2,
+    "export_excel_to_csv": 2,
+    "apply_excel_operations": 2,
+    **parse_limits(os.getenv("TOOL_CONCURRENCY", "")),
+}
+# How often row-writing loops report progress to a background job
+PROGRESS_EVERY_ROWS = 1000
+# Opt-in profiling: PROFILE_TOOLS="format_excel_cells,..." or "*" for all
+PROFILE_TOOLS = [
+    t.strip() for t in os.getenv("PROFILE_TOOLS", "").split(",") if t.strip()
+]
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "1.0"))
+PROFILE_MIN_SECONDS = float(os.getenv("PROFILE_MIN_SECONDS", "0"))
+PROFILE_FORMAT = [
+    f.strip() for f in os.getenv("PROFILE_FORMAT", "prof").split(",") if f.strip()
+]
+PROFILE_DIR = os.getenv("PROFILE_DIR", "./profiles")
+# Enables the /admin endpoints on the file server; requests must send
+# "Authorization: Bearer <ADMIN_TOKEN>"
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+MEMORY_SNAPSHOTS = int(os.getenv("MEMORY_SNAPSHOTS", "10"))
+
+# Progress callback for background jobs, called with rows=/bytes= counters.
+# It raises JobCancelled when the job has been cancelled, unless it is called
+# with check_cancel=False (used for the final report, after the file is saved).
+ProgressCallback = Callable[..., None]
 
 app = FastMCP()
+metrics = MetricsRegistry("excel_mcp")
+metadata_cache = MetadataCache(INFO_CACHE_SIZE)
+# Shared for reads, exclusive for writes, per output file
+path_locks = PathLockManager()
+workbook_cache = WorkbookCache(
+    WORKBOOK_CACHE_MB * 1024 * 1024,
+    WORKBOOK_FLUSH_DELAY,
+    loader=metrics.timed("load", lambda path: load_workbook(path)),
+    saver=lambda wb, path: save_workbook(wb, path),
+    locks=path_locks,
+)
+job_manager = JobManager(JOB_WORKERS, JOB_QUEUE_SIZE, JOB_HISTORY)
+# Tool bodies run here instead of on FastMCP's event loop
+tool_executor = ToolExecutor(
+    TOOL_WORKERS, TOOL_CONCURRENCY, LIGHT_TOOLS, TOOL_RESERVED_WORKERS
+)
+profiler = ToolProfiler(
+    PROFILE_DIR,
+    PROFILE_TOOLS,
+    sample_rate=PROFILE_SAMPLE_RATE,
+    min_seconds=PROFILE_MIN_SECONDS,
+    formats=PROFILE_FORMAT,
+)
+# tracemalloc control for /admin/memory
+memory_inspector = MemoryInspector(MEMORY_SNAPSHOTS)
+# Write back coalesced changes that are still pending at shutdown
+atexit.register(workbook_cache.flush)
+atexit.register(job_manager.shutdown)
+atexit.register(tool_executor.shutdown)
+atexit.register(shutdown_pool)
+
+
+def collect_runtime_metrics() -> Iterable[Sample]:
+    """Report cache, lock, job and worker-pool state for /metrics."""
+    info = metadata_cache.stats()
+    yield ("info_cache_hits_total", "counter", "Metadata cache hits", {}, info["hits"])
+    yield (
+        "info_cache_misses_total",
+        "counter",
+        "Metadata cache misses",
+        {},
+        info["misses"],
+    )
+    yield ("info_cache_entries", "gauge", "Metadata cache entries", {}, info["entries"])
+
+    cache = workbook_cache.stats()
+    for key in ("entries", "dirty", "bytes"):
+        yield (
+            f"workbook_cache_{key}",
+            "gauge",
+            f"Cached workbooks: {key}",
+            {},
+            cache[key],
+        )
+    for key in ("loads", "saves"):
+        yield (
+            f"workbook_cache_{key}_total",
+            "counter",
+            f"Workbook cache {key}",
+            {},
+            cache[key],
+        )
+
+    for mode, lock_stats in path_locks.stats().items():
+        if mode == "locks":
+            continue
+        for key, help_text in (
+            ("acquired", "File lock acquisitions"),
+            ("contended", "File lock acquisitions that had to wait"),
+            ("wait_seconds", "Seconds spent waiting for file locks"),
+        ):
+            yield (
+                f"file_lock_{key}_total",
+                "counter",
+                help_text,
+                {"mode": mode},
+                lock_stats[key],
+            )
+
+    for status, count in job_manager.stats().items():
+        if status != "max_workers":
+            yield (
+                "jobs",
+                "gauge",
+                "Background jobs by status",
+                {"status": status},
+                count,
+            )
+
+    executor = tool_executor.stats()
+    for state in ("running", "waiting"):
+        for tool, count in executor[state].items():
+            yield (
+                f"tool_calls_{state}",
+                "gauge",
+                f"Tool calls {state} for a worker",
+                {"tool": tool},
+                count,
+            )
+
+    memory = memory_inspector.status()
+    if memory["tracing"]:
+        yield (
+            "traced_memory_bytes",
+            "gauge",
+            "Memory traced by tracemalloc",
+            {},
+            memory["current_bytes"],
+        )
+    for tool, tool_memory in memory["tools"].items():
+        yield (
+            "tool_peak_memory_bytes",
+            "gauge",
+            "Largest traced memory increase during a tool call",
+            {"tool": tool},
+            tool_memory["peak_bytes"],
+        )
+
+
+metrics.add_collector(collect_runtime_metrics)
 
 
 def validate_filename(filename: str) -> str:
@@ -57,8 +280,19 @@ def validate_filename(filename: str) -> str:
     return str(output_path / filename)
 
 
-def validate_excel_data(headers: List[str], sheet_data: List[List[str]]) -> None:
-    """Validate Excel data structure and size."""
+def validate_excel_data(
+    headers: List[str], sheet_data: List[List[str]], max_rows: Optional[int] = None
+) -> None:
+    """
+    Validate Excel data structure and size.
+
+    Only the headers and the row count are checked here; each row's width
+    and values are checked while it is written (see ``append_rows``), so
+    large payloads are traversed once.
+    """
+    if max_rows is None:
+        max_rows = MAX_ROWS
+
     if not headers:
         raise ValueError("Headers list cannot be empty")
 
@@ -69,16 +303,60 @@ def validate_excel_data(headers: List[str], sheet_data: List[List[str]]) -> None
         # Add placeholder row with empty values to satisfy Excel requirements
         sheet_data = [[""] * len(headers)]
 
-    if len(sheet_data) > MAX_ROWS:
-        raise ValueError(f"Too many rows (max {MAX_ROWS})")
+    if len(sheet_data) > max_rows:
+        raise ValueError(f"Too many rows (max {max_rows})")
 
-    # Validate each row has correct number of columns
-    expected_cols = len(headers)
-    for i, row in enumerate(sheet_data):
-        if len(row) != expected_cols:
-            raise ValueError(
-                f"Row {i + 1} has {len(row)} columns, expected {expected_cols}"
+
+def describe_bad_row(
+    row_number: int, row: Any, width: Optional[int], error: Exception
+) -> str:
+    """Explain why ``row`` could not be written, for an error message."""
+    if not isinstance(row, (list, tuple)):
+        return f"Row {row_number} is not an array"
+    if width is not None and len(row) != width:
+        return f"Row {row_number} has {len(row)} columns, expected {width}"
+    for col_number, value in enumerate(row, 1):
+        if value is not None and not isinstance(value, CELL_VALUE_TYPES):
+            return (
+                f"Row {row_number}, column {col_number}: unsupported value "
+                f"type {type(value).__name__}"
             )
+    return f"Row {row_number}: {error}"
+
+
+def append_rows(
+    ws,
+    rows: Iterable[Any],
+    width: Optional[int] = None,
+    observe: Optional[Callable[[List[Any]], None]] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
+    """
+    Append data rows to ``ws``, validating each one as it is written.
+
+    With ``width`` every row must be a list of exactly that many values.
+    Cell values are checked by openpyxl as it converts them; the first row
+    that fails stops the write with a ValueError naming the row (and
+    column), so the loop never needs a separate validation pass.
+
+    Returns:
+        Number of rows written
+    """
+    row_count = 0
+    for row_count, row in enumerate(rows, 1):
+        if width is not None and (
+            not isinstance(row, (list, tuple)) or len(row) != width
+        ):
+            raise ValueError(describe_bad_row(row_count, row, width, None))
+        try:
+            ws.append(row)
+        except (TypeError, ValueError) as e:
+            raise ValueError(describe_bad_row(row_count, row, width, e)) from e
+        if observe is not None:
+            observe(row)
+        if progress is not None and row_count % PROGRESS_EVERY_ROWS == 0:
+            progress(rows=row_count)
+    return row_count
 
 
 def validate_excel_request(
@@ -125,12 +403,70 @@ def validate_excel_request(
     return {"valid": len(errors) == 0, "errors": errors, "warnings": warnings}
 
 
-def apply_formatting(
-    ws, headers: List[str], formatting: Optional[Dict[str, Any]] = None
-) -> None:
-    """Apply formatting to the worksheet."""
-    if not formatting:
-        return
+class ColumnWidthEstimator:
+    """
+    Estimate column widths from the longest value seen in each column.
+
+    Rows are observed while they are written, so no cell lookups are needed
+    afterwards. When the expected row count exceeds ``sample_rows``, only
+    every n-th row is measured to bound the cost on large sheets.
+
+    Widths are in characters: Excel measures column widths in digits of the
+    workbook's default font, which is the font the written cells use.
+    """
+
+    def __init__(
+        self,
+        column_count: int,
+        expected_rows: int = 0,
+        sample_rows: Optional[int] = None,
+    ) -> None:
+        if sample_rows is None:
+            sample_rows = WIDTH_SAMPLE_ROWS
+        self.max_lengths = [0] * column_count
+        self.stride = max(1, expected_rows // max(sample_rows, 1))
+        self._row_count = 0
+
+    def observe_header(self, headers: List[Any]) -> None:
+        """Measure the header row, which is never skipped by sampling."""
+        self._measure(headers)
+
+    def observe(self, row: List[Any]) -> None:
+        """Measure a data row (subject to sampling)."""
+        if self._row_count % self.stride == 0:
+            self._measure(row)
+        self._row_count += 1
+
+    def observe_all(self, rows: List[List[Any]]) -> None:
+        """Measure a list of data rows, visiting only the sampled ones."""
+        for row in rows[:: self.stride]:
+            self._measure(row)
+        self._row_count += len(rows)
+
+    def _measure(self, row: List[Any]) -> None:
+        if not isinstance(row, (list, tuple)):
+            # Rejected when it is written
+            return
+        max_lengths = self.max_lengths
+        for col_idx, value in enumerate(row[: len(max_lengths)]):
+            if value is None:
+                continue
+            length = len(str(value))
+            if length > max_lengths[col_idx]:
+                max_lengths[col_idx] = length
+
+    def widths(self) -> List[float]:
+        """Return the column widths, padded and capped at MAX_COLUMN_WIDTH."""
+        return [min(length + 2, MAX_COLUMN_WIDTH) for length in self.max_lengths]
+
+
+def apply_formatting(ws, headers: List[str], widths: List[float]) -> None:
+    """
+    Apply formatting to the worksheet: a bold, centered header row and the
+    column ``widths`` estimated while the rows were written.
+    """
+    from openpyxl.styles import Alignment, Font
+    from openpyxl.utils import get_column_letter
 
     # Header formatting
     header_font = Font(bold=True)
@@ -142,73 +478,151 @@ def apply_formatting(
         cell.alignment = header_alignment
 
     # Auto-adjust column widths
-    for col_num, _ in enumerate(headers, 1):
-        column_letter = get_column_letter(col_num)
-        max_length = 0
-        for row_num in range(1, len(ws[column_letter]) + 1):
-            cell_value = str(ws.cell(row=row_num, column=col_num).value or "")
-            max_length = max(max_length, len(cell_value))
-        ws.column_dimensions[column_letter].width = min(max_length + 2, 50)
+    for col_num, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(col_num)].width = width
 
 
-def parse_cell_range(cell_range: str) -> tuple:
+def load_workbook(filename: str, **kwargs: Any) -> "Workbook":
+    """``openpyxl.load_workbook``, importing openpyxl on first use."""
+    from openpyxl import load_workbook as openpyxl_load_workbook
+
+    return openpyxl_load_workbook(filename, **kwargs)
+
+
+def save_workbook(wb: "Workbook", path: str) -> None:
     """
-    Parse Excel cell range notation (e.g., 'A1:C10') into row/column indices.
+    Save a workbook by writing a temporary file next to ``path`` and renaming
+    it into place, so readers never see a partially written file.
 
-    Args:
-        cell_range: Excel cell range in format 'A1:C10'
+    With SAVE_FSYNC the data is also flushed to disk before the rename.
+    """
+    with metrics.phase("save"):
+        with atomic_path(path, fsync=SAVE_FSYNC) as tmp_path:
+            wb.save(tmp_path)
+    metrics.record(bytes=os.path.getsize(path))
 
-    Returns:
-        Tuple of (start_row, end_row, start_col, end_col)
 
-    Raises:
-        ValueError: If cell_range format is invalid
+def discard_write_only_sheets(wb: "Workbook") -> None:
+    """
+    Close the row writers of an unsaved write-only workbook and delete the
+    temporary files openpyxl streams their rows into.
     """
+    for ws in wb.worksheets:
+        writer = ws._writer
+        if writer is None or not os.path.exists(writer.out):
+            continue
+        try:
+            if ws._rows is not None:
+                ws._rows.close()
+            writer.close()
+        except Exception as e:
+            logger.debug(f"Error closing write-only sheet {ws.title}: {e}")
+        writer.cleanup()
+
+
+def write_streaming_workbook(
+    path: str,
+    sheet_name: str,
+    headers: List[str],
+    rows: Iterable[List[Any]],
+    formatting: Optional[Dict[str, Any]] = None,
+    progress: Optional[ProgressCallback] = None,
+    row_width: Optional[int] = None,
+) -> int:
+    """
+    Write a single-sheet workbook using openpyxl's write-only mode.
+
+    Rows are serialized to disk as they are appended instead of being kept
+    as cell objects, so memory stays roughly flat as the row count grows.
+    Column widths and header styles must be known before the first row is
+    written, so they are computed up front: from the whole list if ``rows``
+    is a list, otherwise from the first WIDTH_SAMPLE_ROWS rows, which are
+    buffered and then written ahead of the rest of the iterator.
+
+    ``progress`` is called with ``rows=`` every PROGRESS_EVERY_ROWS rows, once
+    with no counters just before saving (the last point where a cancelled job
+    stops) and with ``rows=`` and ``bytes=`` once the file is saved. With ``row_width``
+    every row must have exactly that many values (see ``append_rows``).
+
+    Returns:
+        Number of data rows written
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
     try:
-        if ":" not in cell_range:
-            raise ValueError("Cell range must contain ':' separator")
-
-        parts = cell_range.split(":")
-        if len(parts) != 2:
-            raise ValueError("Cell range must have exactly 2 parts (start:end)")
-
-        start_cell = parts[0].strip().upper()
-        end_cell = parts[1].strip().upper()
-
-        # Parse start cell (e.g., 'A1')
-        start_col_match = re.match(r"([A-Z]+)(\d+)", start_cell)
-        if not start_col_match:
-            raise ValueError(f"Invalid start cell: {start_cell}")
-        start_col_letters = start_col_match.group(1)
-        start_row = int(start_col_match.group(2))
-
-        # Convert column letters to number (A=1, B=2, ..., Z=26, AA=27, etc.)
-        start_col = 0
-        for char in start_col_letters:
-            start_col = start_col * 26 + (ord(char) - ord("A") + 1)
-
-        # Parse end cell (e.g., 'C10')
-        end_col_match = re.match(r"([A-Z]+)(\d+)", end_cell)
-        if not end_col_match:
-            raise ValueError(f"Invalid end cell: {end_cell}")
-        end_col_letters = end_col_match.group(1)
-        end_row = int(end_col_match.group(2))
-
-        # Convert column letters to number
-        end_col = 0
-        for char in end_col_letters:
-            end_col = end_col * 26 + (ord(char) - ord("A") + 1)
-
-        return start_row, end_row, start_col, end_col
-    except Exception as e:
-        raise ValueError(f"Failed to parse cell range '{cell_range}': {str(e)}")
+        if formatting:
+            if isinstance(rows, list):
+                sample = rows
+            else:
+                row_iter = iter(rows)
+                sample = list(islice(row_iter, WIDTH_SAMPLE_ROWS))
+                rows = chain(sample, row_iter)
+
+            # Auto-adjust column widths (must be set before any row is written)
+            estimator = ColumnWidthEstimator(len(headers), expected_rows=len(sample))
+            estimator.observe_header(headers)
+            estimator.observe_all(sample)
+            for col_num, width in enumerate(estimator.widths(), 1):
+                ws.column_dimensions[get_column_letter(col_num)].width = width
+
+            # Header formatting
+            header_font = Font(bold=True)
+            header_alignment = Alignment(horizontal="center")
+            header_row = []
+            for header in headers:
+                cell = WriteOnlyCell(ws, value=header)
+                cell.font = header_font
+                cell.alignment = header_alignment
+                header_row.append(cell)
+            ws.append(header_row)
+        else:
+            ws.append(headers)
+
+        with metrics.phase("mutate"):
+            row_count = append_rows(ws, rows, row_width, progress=progress)
+
+        if progress is not None:
+            # Last chance to cancel: once saved, the file is kept
+            progress()
+        save_workbook(wb, path)
+    finally:
+        # A no-op after a successful save; after a failure it stops the
+        # sheet's row writer and removes its temporary file
+        discard_write_only_sheets(wb)
+    metrics.record(rows=row_count, cells=row_count * len(headers))
+    if progress is not None:
+        progress(rows=row_count, bytes=os.path.getsize(path), check_cancel=False)
+    return row_count
+
+
+@contextmanager
+def open_csv_reader(
+    csv_file: str, delimiter: str = ","
+) -> Iterator[Iterator[List[str]]]:
+    """Yield a lazy csv.reader over a CSV file path or over raw CSV content."""
+    import csv
+
+    if os.path.exists(csv_file):
+        with open(csv_file, "r", encoding="utf-8", newline="") as f:
+            yield csv.reader(f, delimiter=delimiter)
+    else:
+        yield csv.reader(io.StringIO(csv_file, newline=""), delimiter=delimiter)
+
+
+def download_url(filename: str) -> str:
+    """Build the file server URL for a file in the output directory."""
+    file_server_port = int(os.getenv("FILE_SERVER_PORT", "8001"))
+    return f"http://localhost:{file_server_port}/files/{filename}"
 
 
 def format_success_with_download(filename: str, message: str) -> str:
     """Format success message with download link."""
-    file_server_port = int(os.getenv("FILE_SERVER_PORT", "8001"))
-    download_url = f"http://localhost:{file_server_port}/files/{filename}"
-    return f"{message}\n\n📥 **Download:** {download_url}"
+    return f"{message}\n\n📥 **Download:** {download_url(filename)}"
 
 
 @app.resource(uri="mcp://resources/system_prompt")
@@ -225,12 +639,18 @@ def system_prompt() -> str:
 
 
 @app.tool()
+@tool_executor.offload
+@metrics.instrument
+@profiler.instrument
+@memory_inspector.instrument
 def create_excel_file(
     filename: str,
     headers: List[str],
     sheet_data: List[List[Any]],
     sheet_name: str = "Sheet1",
     formatting: Optional[Dict[str, Any]] = None,
+    streaming: Optional[bool] = None,
+    run_async: Annotated[bool, Field(alias="async")] = False,
 ) -> str:
     """
     Creates an Excel file with the given data.
@@ -241,17 +661,109 @@ def create_excel_file(
         sheet_data: 2D list of data rows
         sheet_name: Name of the worksheet (default: "Sheet1")
         formatting: Optional formatting options
+        streaming: Write rows with a write-only worksheet to keep memory flat
+            (default: automatic above STREAMING_THRESHOLD rows)
+        async: Run in the background and return a job id to poll with
+            get_job_status (default: false)
 
     Returns:
-        Success message with file path
+        Success message with file path, or the job id when run with async
     """
     try:
         logger.info(f"Creating Excel file: {filename}")
 
+        if streaming is None:
+            streaming = len(sheet_data or []) > STREAMING_THRESHOLD
+
         # Validate inputs
-        safe_filename = validate_filename(filename)
-        validate_excel_data(headers, sheet_data)
+        with metrics.phase("validation"):
+            safe_filename = validate_filename(filename)
+            validate_excel_data(
+                headers, sheet_data, MAX_STREAMING_ROWS if streaming else MAX_ROWS
+            )
+
+        def work(progress: Optional[ProgressCallback]) -> str:
+            with path_locks.write(safe_filename):
+                write_excel_file(
+                    safe_filename,
+                    sheet_name,
+                    headers,
+                    sheet_data,
+                    formatting,
+                    streaming,
+                    progress,
+                )
+            logger.info(f"Successfully created Excel file: {safe_filename}")
+            return format_success_with_download(
+                filename, f"Successfully created Excel file: {safe_filename}"
+            )
+
+        if run_async:
+            return start_job("create_excel_file", filename, work)
+        return work(None)
 
+    except ValueError as e:
+        error_msg = f"Validation error: {str(e)}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    except Exception as e:
+        error_msg = f"Failed to create Excel file: {str(e)}"
+        logger.error(error_msg)
+        raise Exception(error_msg)
+
+
+def write_excel_file(
+    path: str,
+    sheet_name: str,
+    headers: List[str],
+    sheet_data: List[List[Any]],
+    formatting: Optional[Dict[str, Any]],
+    streaming: bool,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
+    """
+    Write rows to a new single-sheet workbook at ``path``.
+
+    Each row is checked to have one value per header as it is written; the
+    first bad row raises ValueError and leaves any existing file untouched.
+    The caller must hold the write lock for ``path``.
+
+    Returns:
+        Number of data rows written
+    """
+    if streaming:
+        row_count = write_streaming_workbook(
+            path,
+            sheet_name,
+            headers,
+            sheet_data,
+            formatting,
+            progress,
+            row_width=len(headers),
+        )
+    else:
+        row_count = write_regular_workbook(
+            path, sheet_name, headers, sheet_data, formatting, progress
+        )
+
+    # The file has been replaced; drop any cached copy of the old one (no
+    # one else can use it while the caller holds the write lock)
+    workbook_cache.discard(path)
+    return row_count
+
+
+def write_regular_workbook(
+    path: str,
+    sheet_name: str,
+    headers: List[str],
+    sheet_data: List[List[Any]],
+    formatting: Optional[Dict[str, Any]],
+    progress: Optional[ProgressCallback] = None,
+) -> int:
+    """Write ``sheet_data`` with a regular (in-memory) worksheet."""
+    from openpyxl import Workbook
+
+    with metrics.phase("mutate"):
         # Create workbook
         wb = Workbook()
         ws = wb.active
@@ -260,35 +772,96 @@ def create_excel_file(
         else:
             ws.title = sheet_name
 
+        # Track column widths while rows are written
+        estimator = None
+        if formatting:
+            estimator = ColumnWidthEstimator(
+                len(headers), expected_rows=len(sheet_data)
+            )
+            estimator.observe_header(headers)
+
         # Add headers
         ws.append(headers)
 
-        # Add data rows
-        for row in sheet_data:
-            ws.append(row)
+        # Add data rows, checking each one as it is written
+        append_rows(
+            ws,
+            sheet_data,
+            len(headers),
+            estimator.observe if estimator is not None else None,
+            progress,
+        )
 
         # Apply formatting
-        apply_formatting(ws, headers, formatting)
+        if estimator is not None:
+            apply_formatting(ws, headers, estimator.widths())
 
-        # Save file
-        wb.save(safe_filename)
-        logger.info(f"Successfully created Excel file: {safe_filename}")
+    if progress is not None:
+        # Last chance to cancel: once saved, the file is kept
+        progress()
+    save_workbook(wb, path)
+    metrics.record(rows=len(sheet_data), cells=len(sheet_data) * len(headers))
+    if progress is not None:
+        progress(rows=len(sheet_data), bytes=os.path.getsize(path), check_cancel=False)
+    return len(sheet_data)
 
-        return format_success_with_download(
-            filename, f"Successfully created Excel file: {safe_filename}"
-        )
 
-    except ValueError as e:
-        error_msg = f"Validation error: {str(e)}"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
-    except Exception as e:
-        error_msg = f"Failed to create Excel file: {str(e)}"
-        logger.error(error_msg)
-        raise Exception(error_msg)
+def start_job(
+    tool: str, filename: str, work: Callable[[Optional[ProgressCallback]], str]
+) -> str:
+    """Run ``work(progress)`` as a background job and return the job id message."""
+
+    def run(job: Job) -> str:
+        with metrics.tool_scope(tool), memory_inspector.track(tool):
+            with profiler.profile(tool):
+                return work(job.report)
+
+    job = job_manager.submit(tool, run, output=filename)
+    return (
+        f"Started job {job.id} for {filename}. "
+        f'Call get_job_status with job_id="{job.id}" to follow its progress '
+        "and get the download link."
+    )
+
+
+def load_workbook_metadata(path: str) -> Dict[str, Any]:
+    """Collect sheet metadata by fully loading the workbook (slow path)."""
+    wb = load_workbook(path)
+    try:
+        sheet_info = {}
+        for sheet_name in wb.sheetnames:
+            ws = wb[sheet_name]
+            sheet_info[sheet_name] = {
+                "dimensions": ws.dimensions,
+                "max_row": ws.max_row,
+                "max_column": ws.max_column,
+            }
+        return {
+            "sheets": wb.sheetnames,
+            "active_sheet": wb.active.title if wb.active else None,
+            "sheet_info": sheet_info,
+        }
+    finally:
+        wb.close()
+
+
+def read_excel_metadata(path: str) -> Dict[str, Any]:
+    """
+    Read sheet metadata straight from the zip, falling back to a full load
+    for files the fast reader cannot handle.
+    """
+    try:
+        return read_workbook_metadata(path)
+    except (zipfile.BadZipFile, KeyError, ET.ParseError, ValueError) as e:
+        logger.warning(f"Fast metadata read failed for {path}: {e}")
+        return load_workbook_metadata(path)
 
 
 @app.tool()
+@tool_executor.offload
+@metrics.instrument
+@profiler.instrument
+@memory_inspector.instrument
 def get_excel_info(filename: str) -> Dict[str, Any]:
     """
     Get information about an existing Excel file.
@@ -305,43 +878,246 @@ def get_excel_info(filename: str) -> Dict[str, Any]:
         if not Path(safe_filename).exists():
             raise FileNotFoundError(f"File not found: {safe_filename}")
 
-        # Load the actual workbook to get file information
-        wb = load_workbook(safe_filename)
-
-        # Get sheet information
-        sheet_info = {}
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            sheet_info[sheet_name] = {
-                "dimensions": ws.dimensions,
-                "max_row": ws.max_row,
-                "max_column": ws.max_column,
-            }
+        # Make sure pending in-memory changes are on disk before reading it
+        workbook_cache.flush(safe_filename)
+        with path_locks.read(safe_filename):
+            metadata = metadata_cache.get(safe_filename, read_excel_metadata)
 
-        # Get file statistics
-        file_size = Path(safe_filename).stat().st_size
+            # Get file statistics
+            file_size = Path(safe_filename).stat().st_size
 
-        result = {
+        return {
             "filename": safe_filename,
             "exists": True,
             "size": file_size,
             "size_kb": round(file_size / 1024, 2),
-            "sheet_count": len(wb.sheetnames),
-            "sheets": wb.sheetnames,
-            "active_sheet": wb.active.title if wb.active else None,
-            "sheet_info": sheet_info,
+            "sheet_count": len(metadata["sheets"]),
+            "sheets": metadata["sheets"],
+            "active_sheet": metadata["active_sheet"],
+            "sheet_info": metadata["sheet_info"],
         }
 
-        wb.close()
-        return result
-
     except Exception as e:
         error_msg = f"Failed to get Excel info: {str(e)}"
         logger.error(error_msg)
         return {"error": error_msg}
 
 
+def select_worksheet(wb, sheet_name: Optional[str] = None):
+    """Return the named worksheet, or the active one if it does not exist."""
+    if sheet_name and sheet_name in wb.sheetnames:
+        ws = wb[sheet_name]
+    else:
+        ws = wb.active
+
+    if ws is None:
+        raise ValueError("Worksheet not found")
+    return ws
+
+
+def add_chart_to_worksheet(ws, chart_type: str, data_range: str, title: str) -> None:
+    """Build a chart of ``chart_type`` over ``data_range`` and add it to ``ws``."""
+    from openpyxl.chart import BarChart, LineChart, PieChart, ScatterChart, Reference
+
+    # Create chart based on type
+    if chart_type == "bar":
+        chart = BarChart()
+    elif chart_type == "line":
+        chart = LineChart()
+    elif chart_type == "pie":
+        chart = PieChart()
+    elif chart_type == "scatter":
+        chart = ScatterChart()
+    else:
+        chart = BarChart()  # Default to bar chart
+
+    # Set data range
+    try:
+        # The data may be on another sheet ('Data'!A1:C10 or a defined name)
+        data_ws, ref = resolve_range(ws, data_range)
+        start_row, end_row = ref.min_row, ref.max_row
+        start_col, end_col = ref.min_col, ref.max_col
+
+        # Add data to chart with proper series configuration
+        data = Reference(
+            data_ws,
+            min_col=start_col,
+            min_row=start_row,
+            max_col=end_col,
+            max_row=end_row,
+        )
+
+        # Add data with titles from first row
+        chart.add_data(data, titles_from_data=True)
+
+        # For data series, use columns starting from second column
+        if end_col > start_col:
+            for col in range(start_col + 1, end_col + 1):
+                series_data = Reference(
+                    data_ws,
+                    min_col=col,
+                    min_row=start_row,
+                    max_row=end_row,
+                )
+                chart.series.append(series_data)
+
+        # Set category labels (first column)
+        categories = Reference(
+            data_ws,
+            min_col=start_col,
+            min_row=start_row + 1,
+            max_row=end_row,
+        )
+        chart.set_categories(categories)
+
+    except Exception as e:
+        raise ValueError(f"Invalid data range '{data_range}': {str(e)}")
+
+    # Set chart title
+    chart.title = title
+
+    # Add chart to worksheet
+    ws.add_chart(chart)
+
+
+class CellStyle(NamedTuple):
+    """Interned style objects resolved from a ``formatting`` dict."""
+
+    font: Optional["Font"]
+    fill: Optional["PatternFill"]
+    alignment: Optional["Alignment"]
+    border: Optional["Border"]
+
+
+# Workbook style collection and StyleArray attribute for each CellStyle field
+_STYLE_SLOTS = (
+    ("font", "_fonts", "fontId"),
+    ("fill", "_fills", "fillId"),
+    ("alignment", "_alignments", "alignmentId"),
+    ("border", "_borders", "borderId"),
+)
+
+
+def _color_key(value: Any) -> Optional[str]:
+    return str(value).upper() if value else None
+
+
+def style_key(formatting: Dict[str, Any]) -> tuple:
+    """Normalize the style-relevant options of a ``formatting`` dict."""
+    return (
+        formatting.get("bold"),
+        formatting.get("italic"),
+        formatting.get("underline"),
+        formatting.get("font_size"),
+        _color_key(formatting.get("font_color")),
+        _color_key(formatting.get("background_color")),
+        formatting.get("alignment") or None,
+        bool(formatting.get("border")),
+        _color_key(formatting.get("border_color")) or "000000",
+    )
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def _build_style(key: tuple) -> CellStyle:
+    (
+        bold,
+        italic,
+        underline,
+        font_size,
+        font_color,
+        background_color,
+        alignment,
+        border,
+        border_color,
+    ) = key
+
+    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+    # Font formatting
+    font_kwargs = {}
+    if bold is not None:
+        font_kwargs["bold"] = bold
+    if italic is not None:
+        font_kwargs["italic"] = italic
+    if underline is not None:
+        font_kwargs["underline"] = underline
+    if font_size is not None:
+        font_kwargs["size"] = font_size
+    if font_color:
+        font_kwargs["color"] = font_color
+
+    # Border
+    thin_border = None
+    if border:
+        side = Side(style="thin", color=border_color)
+        thin_border = Border(left=side, right=side, top=side, bottom=side)
+
+    return CellStyle(
+        font=Font(**font_kwargs) if font_kwargs else None,
+        fill=(
+            PatternFill(
+                start_color=background_color,
+                end_color=background_color,
+                fill_type="solid",
+            )
+            if background_color
+            else None
+        ),
+        alignment=Alignment(horizontal=alignment) if alignment else None,
+        border=thin_border,
+    )
+
+
+def resolve_style(formatting: Dict[str, Any]) -> CellStyle:
+    """
+    Turn a ``formatting`` dict into style objects, built once per distinct
+    set of options and shared across calls.
+    """
+    return _build_style(style_key(formatting))
+
+
+def apply_cell_formatting(ws, cell_range: str, formatting: Dict[str, Any]) -> None:
+    """Apply a ``formatting`` dict to every cell in ``cell_range`` of ``ws``."""
+    try:
+        style = resolve_style(formatting)
+        ws, ref = resolve_range(ws, cell_range)
+
+        # Register each style with the workbook once, then assign the
+        # resulting ids to every cell (this is what the cell.font etc.
+        # setters do, minus the per-cell hashing of the style object).
+        wb = ws.parent
+        style_ids = [
+            (attr, getattr(wb, collection).add(getattr(style, field)))
+            for field, collection, attr in _STYLE_SLOTS
+            if getattr(style, field) is not None
+        ]
+        if not style_ids:
+            return
+
+        from openpyxl.styles.cell_style import StyleArray
+
+        for row in ws.iter_rows(
+            min_row=ref.min_row,
+            max_row=ref.max_row,
+            min_col=ref.min_col,
+            max_col=ref.max_col,
+        ):
+            for cell in row:
+                cell_style = cell._style
+                if cell_style is None:
+                    cell_style = cell._style = StyleArray()
+                for attr, style_id in style_ids:
+                    setattr(cell_style, attr, style_id)
+
+    except Exception as e:
+        raise ValueError(f"Invalid cell range '{cell_range}': {str(e)}")
+
+
 @app.tool()
+@tool_executor.offload
+@metrics.instrument
+@profiler.instrument
+@memory_inspector.instrument
 def create_excel_chart(
     filename: str,
     chart_type: str,
@@ -355,7 +1131,8 @@ def create_excel_chart(
     Args:
         filename: Target Excel file to add chart to
         chart_type: Type of chart to create (bar, line, pie, scatter, area)
-        data_range: Cell range for chart data (e.g., 'A1:C10')
+        data_range: Cell range for chart data: 'A1:C10', whole columns ('A:C'),
+            another sheet ('Q1 Sales'!A1:D10) or a defined name
         title: Chart title (optional)
         sheet_name: Worksheet name (optional, defaults to first sheet)
 
@@ -376,78 +1153,11 @@ def create_excel_chart(
         if not Path(safe_filename).exists():
             raise FileNotFoundError(f"Excel file not found: {safe_filename}")
 
-        # Load existing workbook
-        wb = load_workbook(safe_filename)
-
-        # Select worksheet
-        if sheet_name and sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-        else:
-            ws = wb.active
+        with workbook_cache.checkout(safe_filename, write=True) as wb:
+            with metrics.phase("mutate"):
+                ws = select_worksheet(wb, sheet_name)
+                add_chart_to_worksheet(ws, chart_type, data_range, title)
 
-        if ws is None:
-            raise ValueError("Worksheet not found")
-
-        # Create chart based on type
-        if chart_type == "bar":
-            chart = BarChart()
-        elif chart_type == "line":
-            chart = LineChart()
-        elif chart_type == "pie":
-            chart = PieChart()
-        elif chart_type == "scatter":
-            chart = ScatterChart()
-        else:
-            chart = BarChart()  # Default to bar chart
-
-        # Set data range
-        try:
-            # Parse the data_range parameter to get specific cell range
-            start_row, end_row, start_col, end_col = parse_cell_range(data_range)
-
-            # Add data to chart with proper series configuration
-            data = Reference(
-                ws,
-                min_col=start_col,
-                min_row=start_row,
-                max_col=end_col,
-                max_row=end_row,
-            )
-
-            # Add data with titles from first row
-            chart.add_data(data, titles_from_data=True)
-
-            # For data series, use columns starting from second column
-            if end_col > start_col:
-                for col in range(start_col + 1, end_col + 1):
-                    series_data = Reference(
-                        ws,
-                        min_col=col,
-                        min_row=start_row,
-                        max_row=end_row,
-                    )
-                    chart.series.append(series_data)
-
-            # Set category labels (first column)
-            categories = Reference(
-                ws,
-                min_col=start_col,
-                min_row=start_row + 1,
-                max_row=end_row,
-            )
-            chart.set_categories(categories)
-
-        except Exception as e:
-            raise ValueError(f"Invalid data range '{data_range}': {str(e)}")
-
-        # Set chart title
-        chart.title = title
-
-        # Add chart to worksheet
-        ws.add_chart(chart)
-
-        # Save workbook
-        wb.save(safe_filename)
         logger.info(f"Successfully added {chart_type} chart to {safe_filename}")
 
         return format_success_with_download(
@@ -462,6 +1172,10 @@ def create_excel_chart(
 
 
 @app.tool()
+@tool_executor.offload
+@metrics.instrument
+@profiler.instrument
+@memory_inspector.instrument
 def format_excel_cells(
     filename: str,
     cell_range: str,
@@ -473,7 +1187,9 @@ def format_excel_cells(
 
     Args:
         filename: Target Excel file
-        cell_range: Cell range in A1:B5 format (e.g., 'A1:C10')
+        cell_range: Cell or range in A1 notation: 'B2', 'A1:C10', whole
+            columns ('A:C') or rows ('1:5'), another sheet ('Q1 Sales'!A1:D10)
+            or a defined name
         formatting: Formatting options to apply
         sheet_name: Worksheet name (optional, defaults to first sheet)
 
@@ -490,95 +1206,216 @@ def format_excel_cells(
         if not Path(safe_filename).exists():
             raise FileNotFoundError(f"Excel file not found: {safe_filename}")
 
-        # Load existing workbook
-        wb = load_workbook(safe_filename)
+        with workbook_cache.checkout(safe_filename, write=True) as wb:
+            with metrics.phase("mutate"):
+                ws = select_worksheet(wb, sheet_name)
+                apply_cell_formatting(ws, cell_range, formatting)
 
-        # Select worksheet
-        if sheet_name and sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-        else:
-            ws = wb.active
+        logger.info(
+            f"Successfully applied formatting to {cell_range} in {safe_filename}"
+        )
 
-        if ws is None:
-            raise ValueError("Worksheet not found")
+        return format_success_with_download(
+            filename,
+            f"Successfully applied formatting to {cell_range} in {safe_filename}",
+        )
 
-        # Parse cell range and apply formatting
-        try:
-            # Simple approach: iterate through range manually
-            # Parse the cell_range using the helper function
-            start_row, end_row, start_col, end_col = parse_cell_range(cell_range)
-
-            # Apply formatting to all cells in the range
-            for row_idx in range(start_row, end_row + 1):
-                for col_idx in range(start_col, end_col + 1):
-                    cell = ws.cell(row=row_idx, column=col_idx)
-
-                    # Font formatting
-                    font_kwargs = {}
-                    if formatting.get("bold") is not None:
-                        font_kwargs["bold"] = formatting["bold"]
-                    if formatting.get("italic") is not None:
-                        font_kwargs["italic"] = formatting["italic"]
-                    if formatting.get("underline") is not None:
-                        font_kwargs["underline"] = formatting["underline"]
-                    if formatting.get("font_size") is not None:
-                        font_kwargs["size"] = formatting["font_size"]
-                    if formatting.get("font_color"):
-                        font_kwargs["color"] = formatting["font_color"]
-
-                    if font_kwargs:
-                        cell.font = Font(**font_kwargs)
-
-                    # Fill formatting
-                    if formatting.get("background_color"):
-                        cell.fill = PatternFill(
-                            start_color=formatting["background_color"],
-                            end_color=formatting["background_color"],
-                            fill_type="solid",
-                        )
+    except Exception as e:
+        error_msg = f"Failed to format cells: {str(e)}"
+        logger.error(error_msg)
+        raise Exception(error_msg)
 
-                    # Alignment
-                    if formatting.get("alignment"):
-                        cell.alignment = Alignment(horizontal=formatting["alignment"])
-
-                    # Border
-                    if formatting.get("border"):
-                        border_color = formatting.get("border_color", "000000")
-                        thin_border = Border(
-                            left=Side(style="thin", color=border_color),
-                            right=Side(style="thin", color=border_color),
-                            top=Side(style="thin", color=border_color),
-                            bottom=Side(style="thin", color=border_color),
-                        )
-                        cell.border = thin_border
 
-        except Exception as e:
-            raise ValueError(f"Invalid cell range '{cell_range}': {str(e)}")
+def _op_format(wb, op: Dict[str, Any]) -> None:
+    ws = select_worksheet(wb, op.get("sheet_name"))
+    apply_cell_formatting(ws, op["cell_range"], op["formatting"])
+
+
+def _op_chart(wb, op: Dict[str, Any]) -> None:
+    ws = select_worksheet(wb, op.get("sheet_name"))
+    chart_type = op["chart_type"]
+    title = op.get("title") or f"{chart_type.title()} Chart"
+    add_chart_to_worksheet(ws, chart_type, op["data_range"], title)
+
+
+def _op_write_cells(wb, op: Dict[str, Any]) -> None:
+    ws = select_worksheet(wb, op.get("sheet_name"))
+    start_row, start_col = cell_coordinate(op.get("start_cell", "A1"))
+    for row_offset, row in enumerate(op["values"]):
+        for col_offset, value in enumerate(row):
+            ws.cell(
+                row=start_row + row_offset, column=start_col + col_offset, value=value
+            )
+
+
+def _op_add_sheet(wb, op: Dict[str, Any]) -> None:
+    if op["sheet_name"] in wb.sheetnames:
+        raise ValueError(f"Sheet already exists: {op['sheet_name']}")
+    wb.create_sheet(op["sheet_name"], op.get("index"))
+
+
+def _op_rename_sheet(wb, op: Dict[str, Any]) -> None:
+    if op["sheet_name"] not in wb.sheetnames:
+        raise ValueError(f"Sheet not found: {op['sheet_name']}")
+    if op["new_name"] in wb.sheetnames:
+        raise ValueError(f"Sheet already exists: {op['new_name']}")
+    wb[op["sheet_name"]].title = op["new_name"]
+
+
+# Operation type -> (handler, required keys)
+BATCH_OPERATIONS = {
+    "format": (_op_format, ("cell_range", "formatting")),
+    "chart": (_op_chart, ("chart_type", "data_range")),
+    "write_cells": (_op_write_cells, ("values",)),
+    "add_sheet": (_op_add_sheet, ("sheet_name",)),
+    "rename_sheet": (_op_rename_sheet, ("sheet_name", "new_name")),
+}
+
+
+def validate_operations(operations: List[Dict[str, Any]]) -> None:
+    """Check every batch operation has a known type and its required keys."""
+    if not operations:
+        raise ValueError("operations cannot be empty")
+
+    for i, op in enumerate(operations, 1):
+        if not isinstance(op, dict):
+            raise ValueError(f"Operation {i} is not an object")
+        op_type = op.get("type")
+        if op_type not in BATCH_OPERATIONS:
+            raise ValueError(
+                f"Operation {i} has unknown type '{op_type}' "
+                f"(expected one of: {', '.join(BATCH_OPERATIONS)})"
+            )
+        _, required = BATCH_OPERATIONS[op_type]
+        missing = [key for key in required if not op.get(key)]
+        if missing:
+            raise ValueError(
+                f"Operation {i} ({op_type}) is missing: {', '.join(missing)}"
+            )
+
 
-        # Save workbook
-        wb.save(safe_filename)
+@app.tool()
+@tool_executor.offload
+@metrics.instrument
+@profiler.instrument
+@memory_inspector.instrument
+def apply_excel_operations(filename: str, operations: List[Dict[str, Any]]) -> str:
+    """
+    Apply several edits to an existing Excel file in one load/save transaction.
+
+    Operations run in order against the same workbook. If any operation fails,
+    none of the changes are kept.
+
+    Supported operations (``type`` plus its fields):
+        format: cell_range, formatting, sheet_name (optional)
+        chart: chart_type, data_range, title (optional), sheet_name (optional)
+        write_cells: values (2D list), start_cell (default 'A1'), sheet_name (optional)
+        add_sheet: sheet_name, index (optional)
+        rename_sheet: sheet_name, new_name
+
+    Args:
+        filename: Target Excel file
+        operations: Ordered list of operations to apply
+
+    Returns:
+        Success message with a summary of the applied operations
+    """
+    try:
+        if not filename:
+            raise ValueError("filename is required")
+        with metrics.phase("validation"):
+            validate_operations(operations)
+
+        safe_filename = validate_filename(filename)
+
+        if not Path(safe_filename).exists():
+            raise FileNotFoundError(f"Excel file not found: {safe_filename}")
+
+        with path_locks.write(safe_filename):
+            # Save earlier pending edits so a failure below can roll back to
+            # disk
+            workbook_cache.flush(safe_filename)
+
+            with workbook_cache.checkout(
+                safe_filename, write=True
+            ) as wb, metrics.phase("mutate"):
+                for i, op in enumerate(operations, 1):
+                    handler, _ = BATCH_OPERATIONS[op["type"]]
+                    try:
+                        handler(wb, op)
+                    except Exception as e:
+                        raise ValueError(
+                            f"Operation {i} ({op['type']}) failed: {str(e)}"
+                        )
+
+        summary = ", ".join(
+            f"{count} {op_type}"
+            for op_type, count in Counter(op["type"] for op in operations).items()
+        )
         logger.info(
-            f"Successfully applied formatting to {cell_range} in {safe_filename}"
+            f"Successfully applied {len(operations)} operations to {safe_filename}"
         )
 
         return format_success_with_download(
             filename,
-            f"Successfully applied formatting to {cell_range} in {safe_filename}",
+            f"Successfully applied {len(operations)} operations ({summary}) "
+            f"to {safe_filename}",
         )
 
     except Exception as e:
-        error_msg = f"Failed to format cells: {str(e)}"
+        error_msg = f"Failed to apply operations: {str(e)}"
+        logger.error(error_msg)
+        raise Exception(error_msg)
+
+
+@app.tool()
+@tool_executor.offload
+@metrics.instrument
+@profiler.instrument
+@memory_inspector.instrument
+def flush_excel_changes(filename: Optional[str] = None) -> str:
+    """
+    Write pending in-memory changes to disk.
+
+    Edits from create_excel_chart and format_excel_cells are kept in memory
+    and saved after a short idle delay; call this to save them immediately.
+
+    Args:
+        filename: Excel file to flush (optional, defaults to all files)
+
+    Returns:
+        Success message
+    """
+    try:
+        if filename:
+            safe_filename = validate_filename(filename)
+            workbook_cache.flush(safe_filename)
+            return format_success_with_download(
+                filename, f"Saved pending changes to {safe_filename}"
+            )
+
+        workbook_cache.flush()
+        return "Saved pending changes for all cached workbooks"
+
+    except Exception as e:
+        error_msg = f"Failed to flush changes: {str(e)}"
         logger.error(error_msg)
         raise Exception(error_msg)
 
 
 @app.tool()
+@tool_executor.offload
+@metrics.instrument
+@profiler.instrument
+@memory_inspector.instrument
 def import_csv_to_excel(
     csv_file: str,
     excel_file: str,
     delimiter: str = ",",
     has_headers: bool = True,
     sheet_name: str = "Sheet1",
+    infer_types: bool = True,
+    run_async: Annotated[bool, Field(alias="async")] = False,
 ) -> str:
     """
     Convert CSV files to Excel format with proper formatting and structure.
@@ -589,9 +1426,13 @@ def import_csv_to_excel(
         delimiter: CSV delimiter character (default: ',')
         has_headers: Whether CSV has header row (default: true)
         sheet_name: Worksheet name (optional, defaults to 'Sheet1')
+        infer_types: Write numeric, boolean and ISO date columns as typed
+            cells instead of text (default: true)
+        async: Run in the background and return a job id to poll with
+            get_job_status (default: false)
 
     Returns:
-        Success message with file path
+        Success message with file path, or the job id when run with async
     """
     try:
         # Validate inputs
@@ -600,83 +1441,155 @@ def import_csv_to_excel(
 
         safe_excel_file = validate_filename(excel_file)
 
-        # Read CSV data
-        if os.path.exists(csv_file):
-            # Read from file
-            with open(csv_file, "r", encoding="utf-8") as f:
-                csv_reader = csv.reader(f, delimiter=delimiter)
-                rows = list(csv_reader)
-        else:
-            # Treat as CSV content
-            csv_reader = csv.reader(csv_file.splitlines(), delimiter=delimiter)
-            rows = list(csv_reader)
+        def work(progress: Optional[ProgressCallback]) -> str:
+            # Stream CSV rows straight into a write-only worksheet
+            with path_locks.write(safe_excel_file), open_csv_reader(
+                csv_file, delimiter
+            ) as csv_reader:
+                first_row = next(csv_reader, None)
+                if first_row is None:
+                    raise ValueError("CSV file is empty")
+
+                if has_headers:
+                    headers = first_row
+                    data_rows = csv_reader
+                else:
+                    headers = [f"Column {i + 1}" for i in range(len(first_row))]
+                    data_rows = chain([first_row], csv_reader)
+
+                if infer_types:
+                    data_rows = typed_rows(data_rows, CSV_CHUNK_ROWS)
+
+                # Apply basic formatting
+                row_count = write_streaming_workbook(
+                    safe_excel_file,
+                    sheet_name,
+                    headers,
+                    data_rows,
+                    {"auto_width": True, "header_bold": True},
+                    progress,
+                )
+                # The file has been replaced; drop any cached copy of the old
+                # one (a failed import leaves it and its pending edits alone)
+                workbook_cache.discard(safe_excel_file)
 
-        if not rows:
-            raise ValueError("CSV file is empty")
+            logger.info(f"Imported {row_count} CSV rows into {safe_excel_file}")
+            logger.info(f"Successfully converted CSV to Excel: {safe_excel_file}")
 
-        # Create workbook
-        wb = Workbook()
-        ws = wb.active
-        if ws is not None:
-            ws.title = sheet_name
+            return format_success_with_download(
+                excel_file, f"Successfully converted CSV to Excel: {safe_excel_file}"
+            )
 
-        # Write data to worksheet
-        headers = None
-        data_rows = []
+        if run_async:
+            return start_job("import_csv_to_excel", excel_file, work)
+        return work(None)
 
-        if has_headers and rows:
-            headers = rows[0]
-            data_rows = rows[1:]
-        else:
-            headers = [f"Column {i + 1}" for i in range(len(rows[0]))]
-            data_rows = rows
+    except Exception as e:
+        error_msg = f"Failed to import CSV to Excel: {str(e)}"
+        logger.error(error_msg)
+        raise Exception(error_msg)
 
-        # Add headers
-        if ws is not None:
-            ws.append(headers)
 
-        # Add data rows
-        for row in data_rows:
-            if ws is not None:
-                ws.append(row)
+@app.tool()
+@tool_executor.offload
+@metrics.instrument
+@profiler.instrument
+@memory_inspector.instrument
+def get_job_status(job_id: str) -> Dict[str, Any]:
+    """
+    Report the status and progress of a job started with async=true.
 
-        # Apply basic formatting
-        apply_formatting(ws, headers, {"auto_width": True, "header_bold": True})
+    Args:
+        job_id: Id returned when the job was started
 
-        # Save workbook
-        wb.save(safe_excel_file)
-        logger.info(f"Successfully converted CSV to Excel: {safe_excel_file}")
+    Returns:
+        Dictionary with status (queued, running, succeeded, failed or
+        cancelled), progress counters (rows, bytes), timings, the result or
+        error message, and the download URL once the job has succeeded
+    """
+    try:
+        job = job_manager.get(job_id)
+        return job_status(job)
 
-        return format_success_with_download(
-            excel_file, f"Successfully converted CSV to Excel: {safe_excel_file}"
-        )
+    except Exception as e:
+        error_msg = f"Failed to get job status: {str(e)}"
+        logger.error(error_msg)
+        raise Exception(error_msg)
+
+
+@app.tool()
+@tool_executor.offload
+@metrics.instrument
+@profiler.instrument
+@memory_inspector.instrument
+def cancel_job(job_id: str) -> Dict[str, Any]:
+    """
+    Cancel a queued or running job; no file is written for a cancelled job.
+
+    Args:
+        job_id: Id returned when the job was started
+
+    Returns:
+        The job's status after the cancellation request (a running job
+        reports "running" until it reaches its next progress checkpoint)
+    """
+    try:
+        job = job_manager.cancel(job_id)
+        logger.info(f"Cancellation requested for job {job_id}")
+        return job_status(job)
 
     except Exception as e:
-        error_msg = f"Failed to import CSV to Excel: {str(e)}"
+        error_msg = f"Failed to cancel job: {str(e)}"
         logger.error(error_msg)
         raise Exception(error_msg)
 
 
+def job_status(job: Job) -> Dict[str, Any]:
+    """Describe a job, adding the download URL of its output once it succeeded."""
+    status = job.snapshot()
+    if job.status == SUCCEEDED and job.output:
+        status["download_url"] = download_url(job.output)
+    return status
+
+
 @app.tool()
+@tool_executor.offload
+@metrics.instrument
+@profiler.instrument
+@memory_inspector.instrument
 def export_excel_to_csv(
     excel_file: str,
     csv_file: str,
     sheet_name: Optional[str] = None,
     delimiter: str = ",",
     include_headers: bool = True,
+    sheet_names: Optional[List[str]] = None,
+    all_sheets: bool = False,
+    zip_output: bool = False,
+    max_workers: Optional[int] = None,
 ) -> str:
     """
     Export Excel worksheets to CSV format.
 
+    Several sheets can be exported in one call with ``sheet_names`` or
+    ``all_sheets``; each sheet is written by a process-pool worker to its own
+    CSV (``report.csv`` -> ``report_<sheet>.csv``), optionally bundled into
+    a single zip.
+
     Args:
         excel_file: Source Excel file
         csv_file: Target CSV filename
         sheet_name: Worksheet name to export (optional, defaults to first sheet)
         delimiter: CSV delimiter character (default: ',')
         include_headers: Whether to include headers in CSV (default: true)
+        sheet_names: Worksheets to export, one CSV each (optional)
+        all_sheets: Export every worksheet, one CSV each (default: false)
+        zip_output: Bundle multi-sheet CSVs into one .zip (default: false)
+        max_workers: Worker processes for multi-sheet export
+            (optional, defaults to EXPORT_WORKERS)
 
     Returns:
-        Success message with CSV file path
+        Success message with CSV file path and per-sheet timings
     """
     try:
         # Validate inputs
@@ -688,43 +1601,35 @@ def export_excel_to_csv(
         if not Path(safe_excel_file).exists():
             raise FileNotFoundError(f"Excel file not found: {safe_excel_file}")
 
-        # Load workbook
-        wb = load_workbook(safe_excel_file)
-
-        # Select worksheet
-        if sheet_name and sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-        else:
-            ws = wb.active
-
-        # Read data from worksheet
-        data = []
-        if ws is not None:
-            for row in ws.iter_rows(values_only=True):
-                # Convert None to empty string
-                row_data = [cell if cell is not None else "" for cell in row]
-                data.append(row_data)
-
-        if not data:
-            raise ValueError("Worksheet is empty")
-
-        # Create output directory if needed
-        output_dir = Path(csv_file).parent
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Write to CSV
-        with open(csv_file, "w", newline="", encoding="utf-8") as f:
-            csv_writer = csv.writer(f, delimiter=delimiter)
-
-            # Write headers if requested
-            if include_headers and data:
-                csv_writer.writerow(data[0])
-                data = data[1:]
+        workbook_cache.flush(safe_excel_file)
+
+        with path_locks.read(safe_excel_file):
+            if sheet_names or all_sheets:
+                return export_sheets_to_csv(
+                    safe_excel_file,
+                    csv_file,
+                    sheet_names,
+                    delimiter,
+                    include_headers,
+                    zip_output,
+                    max_workers or EXPORT_WORKERS,
+                )
 
-            # Write data rows
-            csv_writer.writerows(data)
+            # Stream rows from a read-only workbook straight into the CSV
+            wb = load_workbook(safe_excel_file, read_only=True)
+            try:
+                ws = select_worksheet(wb, sheet_name)
+                with metrics.phase("export"):
+                    row_count = write_sheet_to_csv(
+                        ws, csv_file, delimiter, include_headers, CSV_PRECOMPRESS
+                    )
+            finally:
+                wb.close()
+        metrics.record(rows=row_count, bytes=os.path.getsize(csv_file))
 
-        logger.info(f"Successfully exported Excel to CSV: {csv_file}")
+        logger.info(
+            f"Successfully exported Excel to CSV: {csv_file} ({row_count} rows)"
+        )
 
         return format_success_with_download(
             csv_file, f"Successfully exported Excel to CSV: {csv_file}"
@@ -736,98 +1641,513 @@ def export_excel_to_csv(
         raise Exception(error_msg)
 
 
+def export_sheets_to_csv(
+    safe_excel_file: str,
+    csv_file: str,
+    sheet_names: Optional[List[str]],
+    delimiter: str,
+    include_headers: bool,
+    zip_output: bool,
+    max_workers: int,
+) -> str:
+    """Export several worksheets in parallel and summarize per-sheet timings."""
+    available = list(read_excel_metadata(safe_excel_file)["sheet_info"])
+    if sheet_names:
+        missing = [name for name in sheet_names if name not in available]
+        if missing:
+            raise ValueError(f"Worksheets not found: {', '.join(missing)}")
+    else:
+        sheet_names = available
+    if not sheet_names:
+        raise ValueError("Workbook has no worksheets to export")
+
+    csv_files = sheet_csv_paths(csv_file, sheet_names)
+    with metrics.phase("export"):
+        results = export_sheets(
+            safe_excel_file,
+            sheet_names,
+            csv_files,
+            delimiter,
+            include_headers,
+            max_workers,
+            # The CSVs are deleted once zipped, so skip their .gz copies
+            precompress=CSV_PRECOMPRESS and not zip_output,
+        )
+    metrics.record(
+        rows=sum(r["rows"] for r in results),
+        bytes=sum(os.path.getsize(r["csv_file"]) for r in results),
+    )
+
+    lines = [
+        f"- {r['sheet']}: {r['rows']} rows in {r['seconds']}s -> {r['csv_file']}"
+        for r in results
+    ]
+    logger.info(
+        f"Exported {len(results)} sheets from {safe_excel_file} "
+        f"with {min(max_workers, len(results))} workers"
+    )
+
+    if zip_output:
+        zip_path = Path(csv_file).with_suffix(".zip")
+        with atomic_path(str(zip_path)) as tmp_path:
+            with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as archive:
+                for r in results:
+                    archive.write(r["csv_file"], Path(r["csv_file"]).name)
+        for r in results:
+            Path(r["csv_file"]).unlink()
+        return format_success_with_download(
+            zip_path.name,
+            f"Successfully exported {len(results)} sheets to {zip_path}:\n"
+            + "\n".join(lines),
+        )
+
+    downloads = "\n".join(
+        f"📥 **Download:** {download_url(Path(r['csv_file']).name)}" for r in results
+    )
+    return (
+        f"Successfully exported {len(results)} sheets to CSV:\n"
+        + "\n".join(lines)
+        + f"\n\n{downloads}"
+    )
+
+
 class FileHandler(SimpleHTTPRequestHandler):
     """Custom handler to serve files from output directory."""
 
+    # Applied to each socket operation, so a client that stops sending its
+    # request or reading the response releases its FileServer worker
+    timeout = FILE_SERVER_TIMEOUT
+
     def __init__(self, *args, **kwargs) -> None:
         """Initialize the file handler for serving files from output directory."""
         # Don't set directory here, we'll handle paths manually
         super().__init__(*args, **kwargs)
 
-    def do_GET(self) -> None:
-        """Handle HTTP GET requests for file downloads."""
+    def _resolve_download(self) -> Optional[Tuple[Path, str]]:
+        """
+        Map the request path to a file in the output directory.
+
+        Sends the 403/404 error response itself and returns None when the
+        request cannot be served.
+        """
         # Parse the path
         parsed_path = urllib.parse.urlparse(self.path)
         file_path = parsed_path.path.lstrip("/")
 
         # Check if this is a file request
-        if file_path.startswith("files/"):
-            filename = file_path[6:]  # Remove 'files/' prefix
-            file_full_path = Path(OUTPUT_DIR) / filename
+        if not file_path.startswith("files/"):
+            self.send_error(404, "Not found")
+            return None
+
+        filename = file_path[6:]  # Remove 'files/' prefix
+        file_full_path = Path(OUTPUT_DIR) / filename
 
-            # Security check - ensure file is within output directory
+        # Security check - ensure file is within output directory
+        try:
+            file_full_path.resolve().relative_to(Path(OUTPUT_DIR).resolve())
+        except ValueError:
+            self.send_error(403, "Access denied")
+            return None
+
+        # Write back cached changes so the download is up to date
+        workbook_cache.flush(str(file_full_path))
+
+        # Check if file exists
+        if not (file_full_path.exists() and file_full_path.is_file()):
+            self.send_error(404, f"File not found: {filename}")
+            return None
+
+        return file_full_path, filename
+
+    def _not_modified(self, etag: str, mtime: float) -> bool:
+        """Evaluate If-None-Match / If-Modified-Since against the file."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            # If-None-Match takes precedence over If-Modified-Since
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
             try:
-                file_full_path.resolve().relative_to(Path(OUTPUT_DIR).resolve())
-            except ValueError:
-                self.send_error(403, "Access denied")
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since
+        return False
+
+    def _range_applies(self, etag: str, last_modified: str) -> bool:
+        """Honour Range only if If-Range (when sent) still matches the file."""
+        if_range = self.headers.get("If-Range")
+        return if_range is None or if_range.strip() in (etag, last_modified)
+
+    def _accepts_gzip(self) -> bool:
+        """Check Accept-Encoding (including q-values) for gzip."""
+        qualities = {}
+        for part in self.headers.get("Accept-Encoding", "").split(","):
+            coding, *params = part.split(";")
+            quality = 1.0
+            for param in params:
+                name, _, value = param.strip().partition("=")
+                if name.lower() == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            if coding.strip():
+                qualities[coding.strip().lower()] = quality
+        if "gzip" in qualities:
+            return qualities["gzip"] > 0
+        return qualities.get("*", 0) > 0
+
+    def _send_not_modified(self, etag: str, last_modified: str, vary: bool) -> None:
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        if vary:
+            self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+
+    def _serve_download(self, send_body: bool) -> None:
+        """
+        Send a file with validators, conditional GET and single byte ranges.
+
+        Compressible files go out gzip-encoded to clients that accept it:
+        from the precompressed ``.gz`` copy written at export time when it
+        is up to date, otherwise compressed on the fly.
+        """
+        resolved = self._resolve_download()
+        if resolved is None:
+            return
+        file_path, filename = resolved
+
+        compressible = file_path.suffix.lower() in COMPRESSIBLE_SUFFIXES
+        encoding = None
+        body_path = file_path
+        if compressible and self._accepts_gzip():
+            encoding = "gzip"
+            sidecar = fresh_gzip_sidecar(file_path)
+            if sidecar is None:
+                self._stream_gzip(file_path, filename, send_body)
+                return
+            body_path = sidecar
+
+        with open(body_path, "rb") as f:
+            # Take size and validators from the open file so they match
+            # what is sent even if the path is replaced meanwhile. The .gz
+            # copy has its own size, so each encoding gets its own ETag.
+            stat = os.fstat(f.fileno())
+            size = stat.st_size
+            etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+            last_modified = formatdate(stat.st_mtime, usegmt=True)
+
+            if self._not_modified(etag, stat.st_mtime):
+                self._send_not_modified(etag, last_modified, compressible)
                 return
 
-            # Check if file exists
-            if file_full_path.exists() and file_full_path.is_file():
-                # Serve the file
-                self.send_response(200)
-                content_type = self.guess_type(str(file_full_path))
-                self.send_header("Content-Type", content_type)
+            start, length = 0, size
+            range_header = self.headers.get("Range")
+            if range_header and self._range_applies(etag, last_modified):
+                try:
+                    byte_range = parse_byte_range(range_header, size)
+                except ValueError:
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if byte_range is not None:
+                    start, end = byte_range
+                    length = end - start + 1
+
+            partial = length != size
+            self.send_response(206 if partial else 200)
+            self.send_header("Content-Type", self.guess_type(str(file_path)))
+            self.send_header(
+                "Content-Disposition", f'attachment; filename="{filename}"'
+            )
+            self.send_header("Content-Length", str(length))
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            if compressible:
+                self.send_header("Vary", "Accept-Encoding")
+            if partial:
                 self.send_header(
-                    "Content-Disposition", f'attachment; filename="{filename}"'
+                    "Content-Range", f"bytes {start}-{start + length - 1}/{size}"
                 )
-                self.send_header("Content-Length", str(file_full_path.stat().st_size))
-                self.end_headers()
+            self.end_headers()
+
+            if send_body and length:
+                # Stream with sendfile(2) where available instead of reading
+                # the whole file into memory
+                sent = self.connection.sendfile(f, start, length)
+                self._count_download(encoding or "identity", sent)
+
+    def _stream_gzip(self, file_path: Path, filename: str, send_body: bool) -> None:
+        """
+        Gzip a file while sending it, for files without an up-to-date .gz copy.
+
+        The compressed length is not known up front, so the body is delimited
+        by closing the connection and Range requests get the whole file.
+        """
+        with open(file_path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            # Weak: the compressed bytes are not guaranteed to be identical
+            etag = f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}-gzip"'
+            last_modified = formatdate(stat.st_mtime, usegmt=True)
+
+            if self._not_modified(etag, stat.st_mtime):
+                self._send_not_modified(etag, last_modified, True)
+                return
 
-                with open(file_full_path, "rb") as f:
-                    self.wfile.write(f.read())
-            else:
-                self.send_error(404, f"File not found: {filename}")
-        else:
-            # Default behavior for other paths
+            self.send_response(200)
+            self.send_header("Content-Type", self.guess_type(str(file_path)))
+            self.send_header(
+                "Content-Disposition", f'attachment; filename="{filename}"'
+            )
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.send_header("Connection", "close")
+            self.close_connection = True
+            self.end_headers()
+
+            if send_body:
+                counter = _CountingWriter(self.wfile)
+                with gzip.GzipFile(fileobj=counter, mode="wb", mtime=0) as gz:
+                    shutil.copyfileobj(f, gz, 64 * 1024)
+                self._count_download("gzip", counter.bytes_written)
+
+    def _count_download(self, encoding: str, sent: int) -> None:
+        metrics.inc("downloads_total", "Files downloaded", encoding=encoding)
+        metrics.inc("download_bytes_total", "Bytes sent by the file server", sent)
+
+    def log_request(self, code="-", size="-") -> None:
+        metrics.inc(
+            "http_responses_total",
+            "File server responses by status code",
+            # HTTPStatus is an int subclass; "-" is used when there is none
+            code=str(int(code)) if isinstance(code, int) else str(code),
+        )
+        super().log_request(code, size)
+
+    def _serve_metrics(self, send_body: bool) -> None:
+        body = metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload, indent=2).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _serve_admin(self, method: str) -> None:
+        """
+        tracemalloc control, only when ADMIN_TOKEN is set:
+
+        - GET  /admin/memory                      status and per-tool memory
+        - POST /admin/memory/start?frames=N       start tracing
+        - POST /admin/memory/stop                 stop tracing
+        - POST /admin/memory/snapshots?label=L    store a snapshot
+        - GET  /admin/memory/top?snapshot=ID      top allocation sites
+        - GET  /admin/memory/diff?from=ID&to=ID   growth between snapshots
+
+        top and diff take limit= and group_by=lineno|filename|traceback;
+        without snapshot=/to= they use memory as it is now.
+        """
+        if not ADMIN_TOKEN:
+            self.send_error(404, "Not found")
+            return
+        expected = f"Bearer {ADMIN_TOKEN}".encode("utf-8")
+        given = self.headers.get("Authorization", "").encode("utf-8")
+        if not hmac.compare_digest(given, expected):
+            self.send_error(401, "Unauthorized")
+            return
+
+        parsed = urllib.parse.urlparse(self.path)
+        params = {k: v[-1] for k, v in urllib.parse.parse_qs(parsed.query).items()}
+
+        def number(
+            name: str, default: Optional[int] = None, required: bool = False
+        ) -> Optional[int]:
+            value = params.get(name)
+            if value is None:
+                if required:
+                    raise ValueError(f"{name}= is required")
+                return default
+            try:
+                return int(value)
+            except ValueError:
+                raise ValueError(f"{name} must be an integer")
+
+        routes: Dict[Tuple[str, str], Callable[[], Any]] = {
+            ("GET", "/admin/memory"): memory_inspector.status,
+            ("POST", "/admin/memory/start"): lambda: memory_inspector.start(
+                number("frames", 1)
+            ),
+            ("POST", "/admin/memory/stop"): memory_inspector.stop,
+            ("POST", "/admin/memory/snapshots"): lambda: memory_inspector.take_snapshot(
+                params.get("label", ""), number("limit", 10)
+            ),
+            ("GET", "/admin/memory/top"): lambda: memory_inspector.top(
+                number("snapshot"),
+                number("limit", 20),
+                params.get("group_by", "lineno"),
+            ),
+            ("GET", "/admin/memory/diff"): lambda: memory_inspector.diff(
+                number("from", required=True),
+                number("to"),
+                number("limit", 20),
+                params.get("group_by", "lineno"),
+            ),
+        }
+        handler = routes.get((method, parsed.path.rstrip("/")))
+        if handler is None:
             self.send_error(404, "Not found")
+            return
+        try:
+            self._send_json(200, handler())
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+
+    def do_GET(self) -> None:
+        """Handle HTTP GET requests for file downloads, /metrics and /admin."""
+        path = urllib.parse.urlparse(self.path).path
+        if path == "/metrics":
+            self._serve_metrics(send_body=True)
+        elif path.startswith("/admin/"):
+            self._serve_admin("GET")
+        else:
+            self._serve_download(send_body=True)
+
+    def do_POST(self) -> None:
+        """Handle HTTP POST requests to the /admin endpoints."""
+        if urllib.parse.urlparse(self.path).path.startswith("/admin/"):
+            self._serve_admin("POST")
+        else:
+            self.send_error(405, "Method not allowed")
 
     def do_HEAD(self) -> None:
         """Handle HTTP HEAD requests for file existence checks."""
-        parsed_path = urllib.parse.urlparse(self.path)
-        file_path = parsed_path.path.lstrip("/")
+        if urllib.parse.urlparse(self.path).path == "/metrics":
+            self._serve_metrics(send_body=False)
+        else:
+            self._serve_download(send_body=False)
 
-        if file_path.startswith("files/"):
-            filename = file_path[6:]  # Remove 'files/' prefix
-            file_full_path = Path(OUTPUT_DIR) / filename
 
-            # Security check
-            try:
-                file_full_path.resolve().relative_to(Path(OUTPUT_DIR).resolve())
-            except ValueError:
-                self.send_error(403, "Access denied")
-                return
+class _CountingWriter:
+    """File-like wrapper that counts the bytes written through it."""
 
-            if file_full_path.exists() and file_full_path.is_file():
-                self.send_response(200)
-                content_type = self.guess_type(str(file_full_path))
-                self.send_header("Content-Type", content_type)
-                self.send_header(
-                    "Content-Disposition", f'attachment; filename="{filename}"'
-                )
-                self.send_header("Content-Length", str(file_full_path.stat().st_size))
-                self.end_headers()
-            else:
-                self.send_error(404, f"File not found: {filename}")
-        else:
-            self.send_error(404, "Not found")
+    def __init__(self, stream) -> None:
+        self.stream = stream
+        self.bytes_written = 0
+
+    def write(self, data: bytes) -> int:
+        self.bytes_written += len(data)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def parse_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range ``Range: bytes=...`` header.
+
+    Returns:
+        Inclusive (start, end) offsets, or None if the header is malformed or
+        asks for several ranges (the full file is served instead)
+
+    Raises:
+        ValueError: If the range cannot be satisfied for a file of ``size``
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, sep, last = spec.strip().partition("-")
+    if not sep or not (first.isdigit() or last.isdigit()):
+        return None
+    if (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(size - suffix, 0), size - 1
+
+    start = int(first)
+    if start >= size:
+        raise ValueError("Unsatisfiable range")
+    end = int(last) if last else size - 1
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+class FileServer(ThreadingHTTPServer):
+    """HTTP server that handles each request on a fixed-size thread pool."""
+
+    def __init__(self, server_address, handler_class, max_workers: int) -> None:
+        super().__init__(server_address, handler_class)
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="file-server"
+        )
+
+    def process_request(self, request, client_address) -> None:
+        # Queue the connection instead of starting an unbounded thread for it
+        self._pool.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._pool.shutdown(wait=False)
 
 
 def start_file_server():
-    """Start a simple HTTP server for file downloads."""
+    """Start a threaded HTTP server for file downloads."""
     file_server_port = int(os.getenv("FILE_SERVER_PORT", "8001"))
-    server = HTTPServer(("0.0.0.0", file_server_port), FileHandler)
-    logger.info(f"File server started on port {file_server_port}")
+    server = FileServer(("0.0.0.0", file_server_port), FileHandler, FILE_SERVER_WORKERS)
+    logger.info(
+        f"File server started on port {file_server_port} "
+        f"with {FILE_SERVER_WORKERS} workers"
+    )
     server.serve_forever()
 
 
 if __name__ == "__main__":
+    # CSV export workers must not re-run this script (see csv_export)
+    skip_main_in_workers()
+
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "8000"))
 
     logger.info(f"Starting Exel MCP server on {host}:{port}")
     logger.info(f"Output directory: {OUTPUT_DIR}")
     logger.info(f"Max rows: {MAX_ROWS}, Max columns: {MAX_COLS}")
+    logger.info(
+        f"Streaming above {STREAMING_THRESHOLD} rows (max {MAX_STREAMING_ROWS})"
+    )
+    logger.info(
+        f"Workbook cache: {WORKBOOK_CACHE_MB} MB, "
+        f"flush after {WORKBOOK_FLUSH_DELAY}s idle"
+    )
+    logger.info(
+        f"Tool workers: {TOOL_WORKERS} ({TOOL_RESERVED_WORKERS} reserved for "
+        f"{', '.join(LIGHT_TOOLS)}), limits: {TOOL_CONCURRENCY}"
+    )
 
     # Start file server in a separate thread
     file_server_thread = threading.Thread(target=start_file_server, daemon=True)
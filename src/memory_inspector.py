@@ -0,0 +1,239 @@
+"""
+Live memory inspection with tracemalloc.
+
+Tracing is off by default because it slows allocation-heavy code (such as
+loading a workbook) noticeably. ``MemoryInspector`` starts and stops it at
+runtime, keeps a few named snapshots, and reports the top allocation sites of
+a snapshot or the difference between two, so growth between two points in
+time can be traced to the lines that allocated it without restarting the
+process.
+
+While tracing, ``instrument``/``track`` also record per-tool memory: the
+peak traced memory above the level at the start of a call, and the memory
+a call left allocated when it returned. Calls that overlap share one
+tracemalloc peak, so per-tool peaks are upper bounds when tools run
+concurrently.
+"""
+
+import functools
+import linecache
+import threading
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+GROUP_BY = ("lineno", "filename", "traceback")
+
+# Allocations made by tracemalloc and the import machinery are noise
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _site(frame: tracemalloc.Frame) -> str:
+    return f"{frame.filename}:{frame.lineno}"
+
+
+class MemoryInspector:
+    """Start/stop tracemalloc, keep snapshots, and report allocation sites."""
+
+    def __init__(self, max_snapshots: int = 10) -> None:
+        self.max_snapshots = max_snapshots
+        self._lock = threading.Lock()
+        self._snapshots: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._next_id = 1
+        self._tools: Dict[str, Dict[str, int]] = {}
+        # Tool calls being tracked; the shared peak is reset when none are
+        self._active = 0
+
+    def start(self, frames: int = 1) -> Dict[str, Any]:
+        """Start tracing, storing ``frames`` frames per allocation."""
+        if frames < 1:
+            raise ValueError("frames must be at least 1")
+        if tracemalloc.is_tracing() and tracemalloc.get_traceback_limit() != frames:
+            # The frame limit can only be set when tracing starts
+            tracemalloc.stop()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop tracing; snapshots already taken are kept."""
+        tracemalloc.stop()
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        """Tracing state, traced memory, stored snapshots and per-tool memory."""
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            snapshots = [
+                {k: v for k, v in entry.items() if k != "snapshot"}
+                for entry in self._snapshots.values()
+            ]
+            tools = {tool: dict(stats) for tool, stats in self._tools.items()}
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else None,
+            "current_bytes": current,
+            "peak_bytes": peak,
+            "overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+            "snapshots": snapshots,
+            "tools": tools,
+        }
+
+    def take_snapshot(self, label: str = "", limit: int = 10) -> Dict[str, Any]:
+        """Store a snapshot and return its id with its top allocation sites."""
+        snapshot = self._take()
+        with self._lock:
+            entry = {
+                "id": self._next_id,
+                "label": label,
+                "taken_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "traced_bytes": sum(s.size for s in snapshot.statistics("filename")),
+                "snapshot": snapshot,
+            }
+            self._snapshots[self._next_id] = entry
+            self._next_id += 1
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        summary = {k: v for k, v in entry.items() if k != "snapshot"}
+        summary["top"] = self._statistics(snapshot, limit, "lineno")
+        return summary
+
+    def top(
+        self,
+        snapshot_id: Optional[int] = None,
+        limit: int = 20,
+        group_by: str = "lineno",
+    ) -> List[Dict[str, Any]]:
+        """Largest allocation sites of a stored snapshot, or of memory right now."""
+        if snapshot_id is None:
+            snapshot = self._take()
+        else:
+            snapshot = self._get(snapshot_id)
+        return self._statistics(snapshot, limit, group_by)
+
+    def diff(
+        self,
+        from_id: int,
+        to_id: Optional[int] = None,
+        limit: int = 20,
+        group_by: str = "lineno",
+    ) -> List[Dict[str, Any]]:
+        """
+        Allocation sites that grew the most between two snapshots.
+
+        Without ``to_id`` the stored snapshot is compared with memory right
+        now.
+        """
+        self._check_group_by(group_by)
+        old = self._get(from_id)
+        new = self._get(to_id) if to_id is not None else self._take()
+        stats = new.compare_to(old, group_by)
+        return [
+            {
+                **self._describe(stat.traceback, group_by),
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+            for stat in stats[:limit]
+        ]
+
+    @contextmanager
+    def track(self, tool: str) -> Iterator[None]:
+        """Record the peak and retained traced memory of a block for ``tool``."""
+        if not tracemalloc.is_tracing():
+            yield
+            return
+        with self._lock:
+            if not self._active:
+                tracemalloc.reset_peak()
+            self._active += 1
+            start = tracemalloc.get_traced_memory()[0]
+        try:
+            yield
+        finally:
+            tracing = tracemalloc.is_tracing()
+            current, peak = tracemalloc.get_traced_memory()
+            with self._lock:
+                self._active -= 1
+                if tracing:
+                    stats = self._tools.setdefault(
+                        tool,
+                        {
+                            "calls": 0,
+                            "peak_bytes": 0,
+                            "last_peak_bytes": 0,
+                            "retained_bytes": 0,
+                        },
+                    )
+                    used = max(peak - start, 0)
+                    stats["calls"] += 1
+                    stats["last_peak_bytes"] = used
+                    stats["peak_bytes"] = max(stats["peak_bytes"], used)
+                    # Growth that outlives the call; steady growth hints at a
+                    # leak
+                    stats["retained_bytes"] += current - start
+
+    def instrument(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a tool function to record its memory use while tracing."""
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self.track(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    def _take(self) -> tracemalloc.Snapshot:
+        if not tracemalloc.is_tracing():
+            raise ValueError("tracemalloc is not tracing; start it first")
+        return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+    def _get(self, snapshot_id: int) -> tracemalloc.Snapshot:
+        with self._lock:
+            entry = self._snapshots.get(snapshot_id)
+        if entry is None:
+            raise ValueError(f"Unknown snapshot: {snapshot_id}")
+        return entry["snapshot"]
+
+    @staticmethod
+    def _check_group_by(group_by: str) -> None:
+        if group_by not in GROUP_BY:
+            raise ValueError(f"group_by must be one of: {', '.join(GROUP_BY)}")
+
+    def _statistics(
+        self, snapshot: tracemalloc.Snapshot, limit: int, group_by: str
+    ) -> List[Dict[str, Any]]:
+        self._check_group_by(group_by)
+        return [
+            {
+                **self._describe(stat.traceback, group_by),
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics(group_by)[:limit]
+        ]
+
+    @staticmethod
+    def _describe(traceback: tracemalloc.Traceback, group_by: str) -> Dict[str, Any]:
+        # Frames run from the oldest to the allocating one
+        frame = traceback[-1]
+        if group_by == "filename":
+            return {"site": frame.filename}
+        described: Dict[str, Any] = {
+            "site": _site(frame),
+            "line": linecache.getline(frame.filename, frame.lineno).strip(),
+        }
+        if group_by == "traceback":
+            described["traceback"] = [_site(f) for f in traceback]
+        return described
@@ -0,0 +1,242 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+``MetricsRegistry.instrument`` wraps a tool function and records its call
+count, error count and latency. While the tool runs, its name is kept in a
+context variable, so code deeper down can time phases (``phase("save")``)
+and count output (``record(rows=..., bytes=...)``) without passing the tool
+name around. Collectors registered with ``add_collector`` contribute values
+that live elsewhere (cache and lock statistics) at scrape time.
+
+The format is plain text, so no client library is needed; any Prometheus
+compatible scraper can read ``render()``'s output.
+"""
+
+import contextvars
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Seconds; covers quick info calls up to large workbook saves
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+Labels = Tuple[Tuple[str, str], ...]
+# (name, type, help, labels, value) as yielded by collectors
+Sample = Tuple[str, str, str, Dict[str, str], float]
+
+# Work outside any tool call (e.g. delayed cache write-backs) is labelled
+# "background"
+_current_tool: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_tool", default="background"
+)
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, bucket_count: int) -> None:
+        self.counts = [0] * bucket_count
+        self.sum = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms keyed on name and labels."""
+
+    def __init__(self, prefix: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.prefix = prefix
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, _Histogram]] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def _name(self, name: str) -> str:
+        return f"{self.prefix}_{name}"
+
+    def inc(self, name: str, help_text: str, value: float = 1, **labels: str) -> None:
+        """Add ``value`` to a counter."""
+        key = _labels(labels)
+        with self._lock:
+            self._help.setdefault(name, ("counter", help_text))
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, help_text: str, value: float, **labels: str) -> None:
+        """Record one observation in a histogram."""
+        key = _labels(labels)
+        with self._lock:
+            self._help.setdefault(name, ("histogram", help_text))
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(len(self.buckets))
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                histogram.counts[index] += 1
+            histogram.sum += value
+            histogram.count += 1
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Register a function that yields samples each time metrics are read."""
+        self._collectors.append(collector)
+
+    @contextmanager
+    def tool_scope(self, tool: str) -> Iterator[None]:
+        """Attribute phases and output recorded in this block to ``tool``."""
+        token = _current_tool.set(tool)
+        try:
+            yield
+        finally:
+            _current_tool.reset(token)
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """Time a phase (validation, load, mutate, save) of the current tool."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(
+                "tool_phase_seconds",
+                "Time spent in each phase of a tool call",
+                time.perf_counter() - start,
+                tool=_current_tool.get(),
+                phase=phase,
+            )
+
+    def timed(self, phase: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap ``fn`` so every call is timed as ``phase``."""
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self.phase(phase):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    def record(self, rows: int = 0, cells: int = 0, bytes: int = 0) -> None:
+        """Count rows, cells and output bytes written by the current tool."""
+        tool = _current_tool.get()
+        if rows:
+            self.inc("rows_written_total", "Rows written", rows, tool=tool)
+        if cells:
+            self.inc("cells_written_total", "Cells written", cells, tool=tool)
+        if bytes:
+            self.inc("output_bytes_total", "Bytes of files written", bytes, tool=tool)
+
+    def instrument(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a tool function to record calls, errors and latency."""
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            failed = True
+            try:
+                with self.tool_scope(name):
+                    result = fn(*args, **kwargs)
+                # Some tools report failures in their result instead of raising
+                failed = isinstance(result, dict) and bool(result.get("error"))
+                return result
+            finally:
+                self.inc("tool_calls_total", "Tool calls", tool=name)
+                if failed:
+                    self.inc("tool_errors_total", "Failed tool calls", tool=name)
+                self.observe(
+                    "tool_duration_seconds",
+                    "Tool call latency",
+                    time.perf_counter() - start,
+                    tool=name,
+                )
+
+        return wrapper
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            help_texts = dict(self._help)
+            counters = {n: dict(s) for n, s in self._counters.items()}
+            histograms = {
+                n: {k: (list(h.counts), h.sum, h.count) for k, h in s.items()}
+                for n, s in self._histograms.items()
+            }
+            collectors = list(self._collectors)
+
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {self._name(name)} {help_text}")
+            lines.append(f"# TYPE {self._name(name)} {kind}")
+
+        for name in sorted(counters):
+            header(name, "counter", help_texts[name][1])
+            for labels, value in sorted(counters[name].items()):
+                lines.append(
+                    f"{self._name(name)}{_format_labels(labels)} {_format_value(value)}"
+                )
+
+        for name in sorted(histograms):
+            header(name, "histogram", help_texts[name][1])
+            full = self._name(name)
+            for labels, (counts, total, count) in sorted(histograms[name].items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    bucket_labels = labels + (("le", _format_value(float(bound))),)
+                    lines.append(
+                        f"{full}_bucket{_format_labels(bucket_labels)} {cumulative}"
+                    )
+                inf_labels = labels + (("le", "+Inf"),)
+                lines.append(f"{full}_bucket{_format_labels(inf_labels)} {count}")
+                lines.append(f"{full}_sum{_format_labels(labels)} {total!r}")
+                lines.append(f"{full}_count{_format_labels(labels)} {count}")
+
+        collected: Dict[str, Tuple[str, str, List[Tuple[Labels, float]]]] = {}
+        for collector in collectors:
+            for name, kind, help_text, labels, value in collector():
+                entry = collected.setdefault(name, (kind, help_text, []))
+                entry[2].append((_labels(labels), value))
+        for name in sorted(collected):
+            kind, help_text, samples = collected[name]
+            header(name, kind, help_text)
+            for labels, value in samples:
+                lines.append(
+                    f"{self._name(name)}{_format_labels(labels)} {_format_value(value)}"
+                )
+
+        return "\n".join(lines) + "\n"
+
+    def value(self, name: str, **labels: str) -> Optional[float]:
+        """Return a counter value, or a histogram's observation count."""
+        key = _labels(labels)
+        with self._lock:
+            if name in self._counters:
+                return self._counters[name].get(key)
+            if name in self._histograms and key in self._histograms[name]:
+                return self._histograms[name][key].count
+        return None
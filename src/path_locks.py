@@ -0,0 +1,186 @@
+"""
+Per-file read/write locks.
+
+Tools that read a workbook from disk share its lock; tools that replace or
+modify it take the lock exclusively, so concurrent calls on the same file
+cannot interleave a load -> modify -> save and lose each other's changes.
+Locks are created on first use and dropped when no thread holds or waits for
+them, and calls on different files never wait for each other.
+
+Waiting writers block new readers, so a stream of get_excel_info calls cannot
+starve a save. A thread holding the write lock may take the read or write
+lock on the same path again (e.g. to flush cached changes while editing);
+upgrading a held read lock to a write lock is not supported.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import ContextManager, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Waits longer than this are logged as contention
+SLOW_WAIT_SECONDS = 1.0
+
+
+class _RWLock:
+    """Writer-preferring read/write lock with a reentrant write side."""
+
+    def __init__(self) -> None:
+        self.cond = threading.Condition(threading.Lock())
+        self.readers = 0
+        self.writer: Optional[int] = None
+        self.write_depth = 0
+        self.waiting_writers = 0
+        # Threads holding or waiting for the lock; the manager drops it at 0
+        self.users = 0
+
+    def acquire_read(self, timeout: Optional[float]) -> bool:
+        me = threading.get_ident()
+        with self.cond:
+            if self.writer == me:
+                self.write_depth += 1
+                return True
+            if not self.cond.wait_for(
+                lambda: self.writer is None and not self.waiting_writers, timeout
+            ):
+                return False
+            self.readers += 1
+            return True
+
+    def release_read(self) -> None:
+        with self.cond:
+            if self.writer == threading.get_ident():
+                self.write_depth -= 1
+                return
+            self.readers -= 1
+            if not self.readers:
+                self.cond.notify_all()
+
+    def acquire_write(self, timeout: Optional[float]) -> bool:
+        me = threading.get_ident()
+        with self.cond:
+            if self.writer == me:
+                self.write_depth += 1
+                return True
+            self.waiting_writers += 1
+            try:
+                if not self.cond.wait_for(
+                    lambda: self.writer is None and not self.readers, timeout
+                ):
+                    return False
+            finally:
+                self.waiting_writers -= 1
+                if not self.waiting_writers and self.writer is None:
+                    # Readers held back by this writer may go ahead if it
+                    # gave up
+                    self.cond.notify_all()
+            self.writer = me
+            self.write_depth = 1
+            return True
+
+    def release_write(self) -> None:
+        with self.cond:
+            self.write_depth -= 1
+            if not self.write_depth:
+                self.writer = None
+                self.cond.notify_all()
+
+
+class PathLockManager:
+    """
+    Shared/exclusive locks keyed on a file's resolved path, with wait-time
+    statistics for spotting contention.
+    """
+
+    def __init__(self) -> None:
+        self._locks: Dict[str, _RWLock] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            mode: {"acquired": 0, "contended": 0, "wait_seconds": 0.0, "max_wait": 0.0}
+            for mode in ("read", "write")
+        }
+
+    def _checkout(self, key: str) -> _RWLock:
+        with self._lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = _RWLock()
+            lock.users += 1
+            return lock
+
+    def _checkin(self, key: str, lock: _RWLock) -> None:
+        with self._lock:
+            lock.users -= 1
+            if not lock.users:
+                del self._locks[key]
+
+    def _record(self, mode: str, key: str, waited: float, contended: bool) -> None:
+        with self._lock:
+            stats = self._stats[mode]
+            stats["acquired"] += 1
+            if contended:
+                stats["contended"] += 1
+                stats["wait_seconds"] += waited
+                stats["max_wait"] = max(stats["max_wait"], waited)
+        if waited >= SLOW_WAIT_SECONDS:
+            logger.info(f"Waited {waited:.2f}s for {mode} lock on {key}")
+
+    @contextmanager
+    def _hold(self, mode: str, path: str, blocking: bool = True) -> Iterator[bool]:
+        key = os.path.realpath(path)
+        lock = self._checkout(key)
+        acquire, release = (
+            (lock.acquire_read, lock.release_read)
+            if mode == "read"
+            else (lock.acquire_write, lock.release_write)
+        )
+        try:
+            # Try without blocking first so uncontended acquisitions are not
+            # counted as waits
+            contended = not acquire(0)
+            if contended and not blocking:
+                yield False
+                return
+            start = time.perf_counter()
+            if contended:
+                acquire(None)
+            self._record(mode, key, time.perf_counter() - start, contended)
+            try:
+                yield True
+            finally:
+                release()
+        finally:
+            self._checkin(key, lock)
+
+    def read(self, path: str) -> ContextManager[bool]:
+        """Context manager holding ``path`` shared with other readers."""
+        return self._hold("read", path)
+
+    def write(self, path: str) -> ContextManager[bool]:
+        """Context manager holding ``path`` exclusively."""
+        return self._hold("write", path)
+
+    def try_write(self, path: str) -> ContextManager[bool]:
+        """Like ``write``, but yields False instead of waiting if ``path`` is busy."""
+        return self._hold("write", path, blocking=False)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return per-mode counters: acquisitions, contended acquisitions, total
+        and maximum seconds spent waiting, plus the number of live locks.
+        """
+        with self._lock:
+            stats = {
+                mode: {
+                    **counters,
+                    "wait_seconds": round(counters["wait_seconds"], 6),
+                    "max_wait": round(counters["max_wait"], 6),
+                }
+                for mode, counters in self._stats.items()
+            }
+            stats["locks"] = {"active": len(self._locks)}
+            return stats
@@ -0,0 +1,190 @@
+"""
+Opt-in profiling of tool calls.
+
+``ToolProfiler.instrument`` wraps a tool function; when profiling is enabled
+for that tool and the call is picked by the sample rate, the call runs under
+a profiler and the result is written to the profiles directory as
+``<tool>-<timestamp>-<duration>ms-<id>.<ext>``:
+
+- ``prof``: cProfile statistics of the calling thread, readable with
+  ``python -m pstats`` or snakeviz
+- ``collapsed``: stacks sampled every few milliseconds from a helper thread,
+  one ``frame;frame;frame count`` line per stack, for flamegraph.pl or
+  speedscope
+
+Calls that finish faster than ``min_seconds`` are discarded, so a low
+threshold and sample rate can stay on in production and only keep the slow
+calls worth looking at.
+"""
+
+import cProfile
+import functools
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("prof", "collapsed")
+# Seconds between stack samples for the collapsed format
+DEFAULT_INTERVAL = 0.005
+
+
+class _StackSampler:
+    """Collect collapsed stacks of one thread from a background thread."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                module = os.path.splitext(os.path.basename(code.co_filename))[0]
+                names.append(f"{module}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def lines(self) -> Iterable[str]:
+        return (f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ToolProfiler:
+    """Profile a sample of tool calls and dump the profiles to disk."""
+
+    def __init__(
+        self,
+        directory: str,
+        tools: Iterable[str] = (),
+        sample_rate: float = 1.0,
+        min_seconds: float = 0.0,
+        formats: Iterable[str] = ("prof",),
+        interval: float = DEFAULT_INTERVAL,
+    ) -> None:
+        """
+        Args:
+            directory: Where profile files are written
+            tools: Tool names to profile; "*" profiles every tool, empty
+                disables profiling
+            sample_rate: Fraction of calls to profile (0-1)
+            min_seconds: Discard profiles of calls faster than this
+            formats: Any of "prof" and "collapsed"
+            interval: Seconds between stack samples for "collapsed"
+        """
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown profile format(s): {', '.join(sorted(unknown))}")
+        self.directory = directory
+        self.tools = set(tools)
+        self.sample_rate = sample_rate
+        self.min_seconds = min_seconds
+        self.formats = tuple(formats)
+        self.interval = interval
+
+    def enabled(self, tool: str) -> bool:
+        """Whether calls of ``tool`` are profiled at all."""
+        return "*" in self.tools or tool in self.tools
+
+    def _sampled(self, tool: str) -> bool:
+        return self.enabled(tool) and random.random() < self.sample_rate
+
+    @contextmanager
+    def profile(self, tool: str) -> Iterator[None]:
+        """
+        Profile the block if ``tool`` is enabled and sampled.
+
+        Only the calling thread is profiled; run the block on the thread that
+        does the work.
+        """
+        if not self._sampled(tool):
+            yield
+            return
+
+        profiler: Optional[cProfile.Profile] = None
+        sampler: Optional[_StackSampler] = None
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                if "collapsed" in self.formats:
+                    sampler = _StackSampler(threading.get_ident(), self.interval)
+                    sampler.start()
+                    stack.callback(sampler.stop)
+                if "prof" in self.formats:
+                    profiler = cProfile.Profile()
+                    try:
+                        profiler.enable()
+                    except ValueError as e:
+                        # Another profiler is already active (Python 3.12+)
+                        logger.warning(f"Not profiling {tool}: {e}")
+                        profiler = None
+                    else:
+                        stack.callback(profiler.disable)
+                yield
+        finally:
+            # Failed calls are dumped too; they are often the interesting ones
+            self._dump(tool, time.perf_counter() - start, profiler, sampler)
+
+    def _dump(
+        self,
+        tool: str,
+        seconds: float,
+        profiler: Optional[cProfile.Profile],
+        sampler: Optional[_StackSampler],
+    ) -> None:
+        if seconds < self.min_seconds:
+            return
+        stem = os.path.join(
+            self.directory,
+            f"{tool}-{datetime.now():%Y%m%d-%H%M%S}-{seconds * 1000:.0f}ms-"
+            f"{uuid.uuid4().hex[:6]}",
+        )
+        written: List[str] = []
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if profiler is not None:
+                profiler.dump_stats(f"{stem}.prof")
+                written.append(f"{stem}.prof")
+            if sampler is not None:
+                with open(f"{stem}.collapsed", "w", encoding="utf-8") as f:
+                    f.writelines(sampler.lines())
+                written.append(f"{stem}.collapsed")
+        except OSError as e:
+            # Profiling must never fail the call it observes
+            logger.error(f"Failed to write profile for {tool}: {e}")
+            return
+        logger.info(f"Profiled {tool} ({seconds:.3f}s): {', '.join(written)}")
+
+    def instrument(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a tool function so sampled calls are profiled."""
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self.profile(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
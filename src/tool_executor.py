@@ -0,0 +1,150 @@
+"""
+Run synchronous tool bodies off the event loop.
+
+FastMCP calls plain (non-async) tool functions directly on its event loop,
+so one long load_workbook or save stalls every other session's requests.
+``ToolExecutor.offload`` turns a tool into a coroutine that runs the original
+function on a shared thread pool. Each tool can also be given a concurrency
+limit, and a few workers can be reserved for quick tools such as
+get_excel_info: every other tool shares the remaining workers, so large
+writes, formatting and charts together can never occupy the whole pool.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_limits(spec: str) -> Dict[str, int]:
+    """
+    Parse a ``tool=limit,tool=limit`` string into a dictionary.
+
+    Raises:
+        ValueError: If an entry is not ``name=<positive integer>``
+    """
+    limits = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        name, sep, value = entry.partition("=")
+        if not sep or not name.strip() or not value.strip().isdigit():
+            raise ValueError(f"Invalid tool concurrency entry: {entry.strip()!r}")
+        if int(value) < 1:
+            raise ValueError(f"Tool concurrency must be at least 1: {entry.strip()!r}")
+        limits[name.strip()] = int(value)
+    return limits
+
+
+class ToolExecutor:
+    """
+    Thread pool for tool bodies with optional per-tool concurrency limits.
+
+    Args:
+        max_workers: Tool calls that may run at the same time overall
+        limits: Maximum concurrent calls per tool name; tools without an
+            entry are only bounded by the workers they may use
+        light: Names of quick tools that may use the reserved workers
+        reserved: Workers kept free for ``light`` tools; all other tools
+            share the remaining ``max_workers - reserved`` (at least one)
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        limits: Optional[Dict[str, int]] = None,
+        light: Iterable[str] = (),
+        reserved: int = 0,
+    ):
+        self.max_workers = max_workers
+        self.limits = dict(limits or {})
+        self.light = frozenset(light)
+        self.reserved = reserved if self.light else 0
+        self.heavy_limit = max(1, max_workers - self.reserved)
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="tool"
+        )
+        # asyncio semaphores belong to one event loop, so keep a set per loop
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._running: Dict[str, int] = {}
+        self._waiting: Dict[str, int] = {}
+
+    def _semaphore(self, key: Any, limit: int) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            per_loop = self._semaphores.setdefault(loop, {})
+            if key not in per_loop:
+                per_loop[key] = asyncio.Semaphore(limit)
+            return per_loop[key]
+
+    def _semaphores_for(self, name: str) -> List[asyncio.Semaphore]:
+        """Semaphores a call must hold, the tool's own limit first."""
+        semaphores = []
+        if name in self.limits:
+            semaphores.append(self._semaphore(name, self.limits[name]))
+        if self.reserved and name not in self.light:
+            # Keyed on None so it cannot clash with a tool name
+            semaphores.append(self._semaphore(None, self.heavy_limit))
+        return semaphores
+
+    def _count(self, counters: Dict[str, int], name: str, delta: int) -> None:
+        with self._lock:
+            counters[name] = counters.get(name, 0) + delta
+
+    def offload(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a synchronous tool function so it runs on the pool."""
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            semaphores = self._semaphores_for(name)
+            acquired: List[asyncio.Semaphore] = []
+            self._count(self._waiting, name, 1)
+            try:
+                for semaphore in semaphores:
+                    await semaphore.acquire()
+                    acquired.append(semaphore)
+            except BaseException:
+                for semaphore in acquired:
+                    semaphore.release()
+                raise
+            finally:
+                self._count(self._waiting, name, -1)
+
+            self._count(self._running, name, 1)
+            try:
+                # Carry context variables (e.g. FastMCP's request context)
+                # over to the worker thread, as asyncio.to_thread does
+                call = functools.partial(
+                    contextvars.copy_context().run, fn, *args, **kwargs
+                )
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._pool, call
+                )
+            finally:
+                self._count(self._running, name, -1)
+                for semaphore in acquired:
+                    semaphore.release()
+
+        return wrapper
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size, limits and running/waiting calls per tool."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "reserved": self.reserved,
+                "limits": dict(self.limits),
+                "running": {k: v for k, v in self._running.items() if v},
+                "waiting": {k: v for k, v in self._waiting.items() if v},
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,168 @@
+"""
+Column type inference for CSV imports.
+
+CSV values arrive as strings. Rows are processed in chunks: each chunk is
+transposed into columns and every column is classified as a whole by
+matching one compiled pattern against the column's values joined with
+newlines, so the type check is a single regex call per column rather than a
+Python-level try/except per cell. Matching columns are then converted in
+bulk to int, float, bool, date or datetime; anything else stays text.
+
+A column's type carries over from chunk to chunk and can only widen (int to
+float, date to datetime, anything to text), so a column never switches back
+to numbers after a chunk has made it text.
+"""
+
+import math
+import re
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Integer parts are limited to 15 digits (Excel keeps 15 significant digits)
+# and may not have leading zeros, so IDs like "00123" stay text
+_INT = r"[+-]?(?:0|[1-9]\d{0,14})"
+_FLOAT = rf"(?:{_INT}(?:\.\d*)?|[+-]?\.\d+)(?:[eE][+-]?\d+)?"
+_BOOL = r"(?i:true|false)"
+_DATE = r"\d{4}-\d{2}-\d{2}"
+_DATETIME = rf"{_DATE}(?:[T ]\d{{2}}:\d{{2}}(?::\d{{2}}(?:\.\d{{1,6}})?)?)?"
+
+_BOOL_VALUES = {"true": True, "false": False}
+
+
+def _column_pattern(value: str) -> "re.Pattern[str]":
+    """Match newline-joined column values that are all ``value`` or empty."""
+    return re.compile(rf"(?:{value})?(?:\n(?:{value})?)*")
+
+
+def _to_bool(value: str) -> bool:
+    return _BOOL_VALUES[value.lower()]
+
+
+def _to_float(value: str) -> float:
+    number = float(value)
+    # "1e400" is inf, which openpyxl writes as an empty cell
+    if not math.isfinite(number):
+        raise ValueError(f"Not a finite number: {value}")
+    return number
+
+
+# Checked in order; the first type whose pattern matches the column wins
+COLUMN_TYPES: Tuple[Tuple[str, "re.Pattern[str]", Callable[[str], Any]], ...] = (
+    ("bool", _column_pattern(_BOOL), _to_bool),
+    ("int", _column_pattern(_INT), int),
+    ("float", _column_pattern(_FLOAT), _to_float),
+    ("date", _column_pattern(_DATE), date.fromisoformat),
+    ("datetime", _column_pattern(_DATETIME), datetime.fromisoformat),
+)
+
+# Types a column already classified as the key may still take in later chunks
+WIDENINGS = {
+    "bool": ("bool",),
+    "int": ("int", "float"),
+    "float": ("float",),
+    "date": ("date", "datetime"),
+    "datetime": ("datetime",),
+    "text": (),
+}
+
+
+def infer_column(
+    values: Sequence[str], previous: Optional[str] = None
+) -> Tuple[str, List[Any]]:
+    """
+    Classify a column of strings and convert it.
+
+    Args:
+        values: The column's values
+        previous: The type earlier chunks gave this column, if any; the
+            column may only keep it or widen it (see ``WIDENINGS``)
+
+    Returns:
+        Tuple of (type name, converted values); empty strings become None
+        in typed columns, and "text" columns are returned unchanged
+    """
+    allowed = WIDENINGS[previous] if previous is not None else None
+    if not any(values) and allowed:
+        # An empty stretch keeps the type the column already has
+        return previous, [None] * len(values)
+
+    joined = "\n".join(values)
+    # A value with an embedded newline would shift the line-per-value layout
+    if (
+        allowed == ()
+        or not joined
+        or joined.count("\n") != len(values) - 1
+        or not joined.strip()
+    ):
+        return "text", list(values)
+
+    for type_name, pattern, convert in COLUMN_TYPES:
+        if allowed is not None and type_name not in allowed:
+            continue
+        if pattern.fullmatch(joined):
+            try:
+                return type_name, [convert(v) if v else None for v in values]
+            except ValueError:
+                # e.g. a well-formed but impossible date such as 2024-02-30,
+                # or a float too large to be finite
+                break
+    return "text", list(values)
+
+
+def infer_rows(
+    rows: Sequence[Sequence[str]], previous: Optional[Sequence[Optional[str]]] = None
+) -> Tuple[List[Optional[str]], List[List[Any]]]:
+    """
+    Convert a chunk of rows column by column.
+
+    Short rows are padded with empty strings while typing; the returned rows
+    keep their original lengths. ``previous`` holds the column types of the
+    earlier chunks (see ``infer_column``).
+
+    Returns:
+        Tuple of (per-column type names, converted rows). A column that has
+        only empty values so far has no type yet (None).
+    """
+    if not rows:
+        return list(previous or []), []
+
+    previous = list(previous or [])
+    width = max(len(row) for row in rows)
+    previous += [None] * (width - len(previous))
+    padded = (list(row) + [""] * (width - len(row)) for row in rows)
+    types: List[Optional[str]] = []
+    converted_columns: List[List[Any]] = []
+    for column, column_type in zip(zip(*padded), previous):
+        type_name, converted = infer_column(column, column_type)
+        types.append(type_name if any(column) else column_type)
+        converted_columns.append(converted)
+
+    converted_rows = [list(row) for row in zip(*converted_columns)]
+    for row, original in zip(converted_rows, rows):
+        del row[len(original) :]
+    return types, converted_rows
+
+
+def typed_rows(
+    rows: Iterable[Sequence[str]],
+    chunk_size: int,
+    on_chunk: Optional[Callable[[List[Optional[str]]], None]] = None,
+) -> Iterator[List[Any]]:
+    """
+    Lazily yield rows with inferred cell types, ``chunk_size`` rows at a time.
+
+    Memory is bounded by the chunk size. Column types carry over between
+    chunks and only widen. ``on_chunk`` receives the column types after
+    every chunk.
+    """
+    row_iter = iter(rows)
+    types: List[Optional[str]] = []
+    while True:
+        chunk = list(islice(row_iter, chunk_size))
+        if not chunk:
+            return
+        types, converted = infer_rows(chunk, types)
+        if on_chunk is not None:
+            on_chunk(types)
+        yield from converted
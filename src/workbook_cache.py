@@ -0,0 +1,262 @@
+"""
+In-memory cache of open workbooks with coalesced write-back.
+
+Mutating tools check a workbook out of the cache instead of calling
+load_workbook/save themselves. The first checkout parses the file; later
+checkouts reuse the same Workbook object. Changes are written back once the
+file has been idle for ``flush_delay`` seconds, when ``flush`` is called
+explicitly (e.g. before the file is downloaded or read from disk), or when
+the entry is evicted because the cache exceeds its memory budget.
+
+Checkouts and write-backs also take the file's lock in a PathLockManager
+(shared for reads, exclusive for writes and saves), so they are ordered with
+tools that read or replace the file on disk without going through the cache.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from path_locks import PathLockManager
+
+logger = logging.getLogger(__name__)
+
+# Rough in-memory cost of one openpyxl cell (Cell object, value and style
+# array); used to estimate how much memory a cached workbook holds.
+CELL_BYTES_ESTIMATE = 300
+
+
+def estimate_workbook_bytes(wb: Any) -> int:
+    """Estimate the memory held by a loaded workbook from its cell count."""
+    cells = 0
+    for ws in wb.worksheets:
+        cells += ws.max_row * ws.max_column
+    return cells * CELL_BYTES_ESTIMATE
+
+
+class _Entry:
+    """A cached workbook and its write-back state."""
+
+    __slots__ = ("workbook", "lock", "dirty", "size", "stat", "timer")
+
+    def __init__(self, workbook: Any, stat: Tuple[int, int]) -> None:
+        self.workbook = workbook
+        self.lock = threading.RLock()
+        self.dirty = False
+        self.size = estimate_workbook_bytes(workbook)
+        self.stat = stat
+        self.timer: Optional[threading.Timer] = None
+
+
+def _file_stat(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class WorkbookCache:
+    """
+    Keep recently used workbooks in memory and coalesce their saves.
+
+    Args:
+        max_bytes: Memory budget for cached workbooks; 0 disables caching,
+            so every checkout loads and every write saves immediately
+        flush_delay: Seconds a dirty workbook must stay untouched before it
+            is written back
+        loader: Function that loads a workbook from a path
+        saver: Function that saves a workbook to a path
+        locks: Per-file locks shared with other readers and writers of the
+            same files (default: a private manager)
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        flush_delay: float,
+        loader: Callable[[str], Any],
+        saver: Callable[[Any, str], None],
+        locks: Optional[PathLockManager] = None,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.flush_delay = flush_delay
+        self.loader = loader
+        self.saver = saver
+        self.locks = locks or PathLockManager()
+        self.loads = 0
+        self.saves = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @contextmanager
+    def checkout(self, path: str, write: bool = False) -> Iterator[Any]:
+        """
+        Yield the workbook for ``path`` with exclusive access to it.
+
+        With ``write=True`` the workbook is marked dirty when the block exits
+        normally and its write-back is (re)scheduled. If the block raises on
+        a workbook with no pending changes, the entry is dropped so the next
+        checkout starts again from the file on disk.
+        """
+        with self.locks.write(path) if write else self.locks.read(path):
+            with self._checkout(path, write) as wb:
+                yield wb
+        self._enforce_budget()
+
+    @contextmanager
+    def _checkout(self, path: str, write: bool) -> Iterator[Any]:
+        key = os.path.realpath(path)
+
+        if not self.enabled:
+            wb = self.loader(path)
+            self.loads += 1
+            try:
+                yield wb
+                if write:
+                    self.saver(wb, path)
+                    self.saves += 1
+            finally:
+                wb.close()
+            return
+
+        while True:
+            entry = self._get_entry(key, path)
+            entry.lock.acquire()
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    break
+            # Evicted between lookup and lock; look it up again
+            entry.lock.release()
+
+        try:
+            try:
+                yield entry.workbook
+            except BaseException:
+                if not entry.dirty:
+                    self._drop(key, entry)
+                raise
+            if write:
+                entry.dirty = True
+                entry.size = estimate_workbook_bytes(entry.workbook)
+                self._schedule_flush(key, entry)
+        finally:
+            entry.lock.release()
+
+    def _get_entry(self, key: str, path: str) -> _Entry:
+        """Return the cached entry for ``key``, (re)loading it if needed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None:
+            with entry.lock:
+                # Reload clean entries the file was changed under (e.g. by
+                # another process); pending in-memory changes take priority.
+                if entry.dirty or entry.stat == _file_stat(path):
+                    return entry
+                self._drop(key, entry)
+
+        entry = _Entry(self.loader(path), _file_stat(path))
+        self.loads += 1
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                # Another thread loaded the same file first
+                entry.workbook.close()
+                return existing
+            self._entries[key] = entry
+        return entry
+
+    def _schedule_flush(self, key: str, entry: _Entry) -> None:
+        if entry.timer is not None:
+            entry.timer.cancel()
+        entry.timer = threading.Timer(self.flush_delay, self.flush, args=(key,))
+        entry.timer.daemon = True
+        entry.timer.start()
+
+    def _write_back(self, key: str, entry: _Entry) -> None:
+        """Save a dirty entry; the caller must hold ``entry.lock``."""
+        if entry.timer is not None:
+            entry.timer.cancel()
+            entry.timer = None
+        if entry.dirty:
+            self.saver(entry.workbook, key)
+            self.saves += 1
+            entry.dirty = False
+            entry.stat = _file_stat(key)
+            logger.info(f"Flushed cached workbook: {key}")
+
+    def flush(self, path: Optional[str] = None) -> None:
+        """Write back pending changes for ``path``, or for every cached file."""
+        if path is None:
+            with self._lock:
+                items = list(self._entries.items())
+        else:
+            key = os.path.realpath(path)
+            with self._lock:
+                entry = self._entries.get(key)
+            items = [(key, entry)] if entry is not None else []
+
+        for key, entry in items:
+            with self.locks.write(key), entry.lock:
+                self._write_back(key, entry)
+
+    def discard(self, path: str) -> None:
+        """Forget a cached workbook without saving it (e.g. before overwrite)."""
+        key = os.path.realpath(path)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            with entry.lock:
+                self._drop(key, entry)
+
+    def _drop(self, key: str, entry: _Entry) -> None:
+        if entry.timer is not None:
+            entry.timer.cancel()
+            entry.timer = None
+        # A flush that looked the entry up before it was dropped must not
+        # write it back over whatever replaces the file
+        entry.dirty = False
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+        entry.workbook.close()
+
+    def _enforce_budget(self) -> None:
+        """Evict least recently used workbooks until under ``max_bytes``."""
+        while True:
+            with self._lock:
+                if sum(e.size for e in self._entries.values()) <= self.max_bytes:
+                    return
+                candidates = list(self._entries.items())
+
+            for key, entry in candidates:
+                # Skip workbooks currently checked out or read by another call
+                with self.locks.try_write(key) as locked:
+                    if locked and entry.lock.acquire(blocking=False):
+                        try:
+                            self._write_back(key, entry)
+                            self._drop(key, entry)
+                        finally:
+                            entry.lock.release()
+                        break
+            else:
+                return
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache occupancy and load/save counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "dirty": sum(1 for e in self._entries.values() if e.dirty),
+                "bytes": sum(e.size for e in self._entries.values()),
+                "max_bytes": self.max_bytes,
+                "loads": self.loads,
+                "saves": self.saves,
+            }
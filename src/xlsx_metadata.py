@@ -0,0 +1,261 @@
+"""
+Fast metadata reader for .xlsx files.
+
+Reads sheet names, the active sheet and each worksheet's used range straight
+from the zip package (``xl/workbook.xml`` and the ``<dimension>`` element at
+the top of every sheet part) without building any cell objects. When a sheet
+has no usable ``<dimension>`` element (write-only writers omit it, some tools
+always write ``A1``), its rows are counted with a streaming XML parse instead.
+
+MetadataCache keeps recent results keyed on the file's identity and stat, so
+repeated lookups of an unchanged file do not touch the zip at all.
+"""
+
+import copy
+import os
+import posixpath
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from typing import Any, Callable, Dict, IO, List, Optional, Tuple
+
+from cell_references import cell_coordinate, column_letter, parse_reference
+
+OFFICE_DOCUMENT_REL = "/officeDocument"
+WORKSHEET_REL = "/worksheet"
+
+
+def _local(tag: str) -> str:
+    """Strip the namespace from an element tag."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _attr(element: ET.Element, name: str) -> Optional[str]:
+    """Get an attribute by local name, ignoring its namespace."""
+    for key, value in element.attrib.items():
+        if _local(key) == name:
+            return value
+    return None
+
+
+def _resolve_target(base_dir: str, target: str) -> str:
+    """Resolve a relationship target against the directory of its source part."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(base_dir, target))
+
+
+def _read_relationships(
+    archive: zipfile.ZipFile, rels_path: str
+) -> Dict[str, Tuple[str, str]]:
+    """Map relationship ids to (type, target) for a .rels part."""
+    if rels_path not in archive.namelist():
+        return {}
+    root = ET.fromstring(archive.read(rels_path))
+    return {
+        rel.get("Id"): (rel.get("Type", ""), rel.get("Target", ""))
+        for rel in root
+        if _local(rel.tag) == "Relationship"
+    }
+
+
+def _find_workbook_part(archive: zipfile.ZipFile) -> str:
+    """Locate the workbook part through the package relationships."""
+    for rel_type, target in _read_relationships(archive, "_rels/.rels").values():
+        if rel_type.endswith(OFFICE_DOCUMENT_REL):
+            return _resolve_target("", target)
+    return "xl/workbook.xml"
+
+
+def _read_dimension(stream: IO[bytes]) -> Optional[str]:
+    """Return the sheet's <dimension ref>, stopping before any cell data."""
+    for _, element in ET.iterparse(stream, events=("start",)):
+        tag = _local(element.tag)
+        if tag == "dimension":
+            return element.get("ref")
+        if tag == "sheetData":
+            return None
+    return None
+
+
+def _count_used_range(stream: IO[bytes]) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Stream through a sheet and return (min_col, min_row, max_col, max_row)
+    of the cells it contains, or None if it has no cells.
+    """
+    min_row = min_col = None
+    max_row = max_col = 0
+    row_idx = 0
+
+    for _, element in ET.iterparse(stream, events=("end",)):
+        if _local(element.tag) != "row":
+            continue
+
+        row_ref = element.get("r")
+        row_idx = int(row_ref) if row_ref else row_idx + 1
+        col_idx = 0
+        for cell in element:
+            if _local(cell.tag) != "c":
+                continue
+            cell_ref = cell.get("r")
+            if cell_ref:
+                col_idx = cell_coordinate(cell_ref)[1]
+            else:
+                col_idx += 1
+            min_col = col_idx if min_col is None else min(min_col, col_idx)
+            max_col = max(max_col, col_idx)
+
+        if col_idx:
+            min_row = row_idx if min_row is None else min(min_row, row_idx)
+            max_row = max(max_row, row_idx)
+        element.clear()
+
+    if min_row is None:
+        return None
+    return min_col, min_row, max_col, max_row
+
+
+def _sheet_info(archive: zipfile.ZipFile, part: str) -> Dict[str, Any]:
+    """Build the dimensions/max_row/max_column summary for one worksheet."""
+    with archive.open(part) as stream:
+        ref = _read_dimension(stream)
+
+    bounds = None
+    if ref and ":" in ref:
+        dimension = parse_reference(ref)
+        bounds = (
+            dimension.min_col,
+            dimension.min_row,
+            dimension.max_col,
+            dimension.max_row,
+        )
+    else:
+        # Missing or single-cell dimension: it cannot be trusted, count rows
+        with archive.open(part) as stream:
+            bounds = _count_used_range(stream)
+
+    if bounds is None:
+        # Same defaults openpyxl reports for an empty worksheet
+        bounds = (1, 1, 1, 1)
+
+    min_col, min_row, max_col, max_row = bounds
+    return {
+        "dimensions": f"{column_letter(min_col)}{min_row}:"
+        f"{column_letter(max_col)}{max_row}",
+        "max_row": max_row,
+        "max_column": max_col,
+    }
+
+
+def read_workbook_metadata(path: str) -> Dict[str, Any]:
+    """
+    Read sheet names, the active sheet and per-sheet dimensions of an .xlsx file.
+
+    Args:
+        path: Path to the .xlsx file
+
+    Returns:
+        Dictionary with ``sheets``, ``active_sheet`` and ``sheet_info`` keys,
+        matching what get_excel_info reports from a fully loaded workbook
+
+    Raises:
+        zipfile.BadZipFile, KeyError, ET.ParseError, ValueError: If the file
+            is not a readable .xlsx package
+    """
+    with zipfile.ZipFile(path) as archive:
+        workbook_part = _find_workbook_part(archive)
+        workbook_dir = posixpath.dirname(workbook_part)
+        rels_path = posixpath.join(
+            workbook_dir, "_rels", posixpath.basename(workbook_part) + ".rels"
+        )
+        relationships = _read_relationships(archive, rels_path)
+
+        root = ET.fromstring(archive.read(workbook_part))
+        active_tab = 0
+        sheets: List[Tuple[str, Optional[str]]] = []
+        for element in root.iter():
+            tag = _local(element.tag)
+            if tag == "workbookView" and element.get("activeTab"):
+                active_tab = int(element.get("activeTab"))
+            elif tag == "sheet":
+                sheets.append((element.get("name"), _attr(element, "id")))
+
+        sheet_names = [name for name, _ in sheets]
+        sheet_info = {}
+        for name, rel_id in sheets:
+            rel_type, target = relationships.get(rel_id, ("", ""))
+            if not rel_type.endswith(WORKSHEET_REL):
+                # Chartsheets and dialog sheets have no cell grid
+                continue
+            sheet_info[name] = _sheet_info(
+                archive, _resolve_target(workbook_dir, target)
+            )
+
+    active_sheet = None
+    if sheet_names:
+        active_sheet = sheet_names[min(active_tab, len(sheet_names) - 1)]
+
+    return {
+        "sheets": sheet_names,
+        "active_sheet": active_sheet,
+        "sheet_info": sheet_info,
+    }
+
+
+class MetadataCache:
+    """
+    Bounded LRU cache of workbook metadata.
+
+    Entries are keyed on ``(resolved path, st_mtime_ns, st_size)``, so any
+    rewrite of the file, by this server or by another process, produces a
+    new key and the stale entry simply ages out.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, path: str, loader: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return cached metadata for ``path``, calling ``loader`` on a miss."""
+        stat = os.stat(path)
+        key = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._entries[key])
+            self.misses += 1
+
+        metadata = loader(path)
+
+        if self.max_entries > 0:
+            with self._lock:
+                self._entries[key] = metadata
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return copy.deepcopy(metadata)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current number of entries."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
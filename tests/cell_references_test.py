@@ -0,0 +1,120 @@
+"""Tests for A1 reference parsing and resolution (src/cell_references.py)."""
+
+import pytest
+from openpyxl import Workbook, load_workbook
+from openpyxl.workbook.defined_name import DefinedName
+
+import main
+from cell_references import (
+    RangeRef,
+    cell_coordinate,
+    column_index,
+    column_letter,
+    parse_reference,
+    resolve_range,
+)
+from conftest import call_tool
+
+
+def test_column_table():
+    assert [column_letter(i) for i in (1, 26, 27, 702, 703, 16384)] == [
+        "A",
+        "Z",
+        "AA",
+        "ZZ",
+        "AAA",
+        "XFD",
+    ]
+    assert column_index("xfd") == 16384
+    with pytest.raises(ValueError):
+        column_index("XFE")
+    with pytest.raises(ValueError):
+        column_letter(0)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("B2", RangeRef(None, 2, 2, 2, 2)),
+        ("c10:a1", RangeRef(None, 1, 10, 1, 3)),
+        ("$A$1:$B$2", RangeRef(None, 1, 2, 1, 2)),
+        ("A:C", RangeRef(None, None, None, 1, 3)),
+        ("5:1", RangeRef(None, 1, 5, None, None)),
+        ("'Q1 Sales'!A1:D10", RangeRef("Q1 Sales", 1, 10, 1, 4)),
+        ("'It''s'!B:B", RangeRef("It's", None, None, 2, 2)),
+        ("Data!3:3", RangeRef("Data", 3, 3, None, None)),
+        ("Übersicht!A1", RangeRef("Übersicht", 1, 1, 1, 1)),
+        ("Umsätze", RangeRef(None, None, None, None, None, "Umsätze")),
+        ("Revenue", RangeRef(None, None, None, None, None, "Revenue")),
+        ("Data!Local", RangeRef("Data", None, None, None, None, "Local")),
+    ],
+)
+def test_parse_reference(text, expected):
+    assert parse_reference(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "A1:", "A0", "XFE1", "A1:B", "1:", "'Q1'A1"])
+def test_parse_reference_rejects_invalid(text):
+    with pytest.raises(ValueError):
+        parse_reference(text)
+
+
+def test_cell_coordinate():
+    assert cell_coordinate("$c$12") == (12, 3)
+    with pytest.raises(ValueError):
+        cell_coordinate("A1:B2")
+
+
+def sales_workbook():
+    wb = Workbook()
+    wb.active.title = "Summary"
+    ws = wb.create_sheet("Q1 Sales")
+    ws.append(["Month", "North", "South"])
+    for month, north, south in (("Jan", 10, 20), ("Feb", 15, 25), ("Mar", 12, 30)):
+        ws.append([month, north, south])
+    wb.defined_names["Revenue"] = DefinedName(
+        "Revenue", attr_text="'Q1 Sales'!$A$1:$C$4"
+    )
+    ws.defined_names["North"] = DefinedName("North", attr_text="'Q1 Sales'!$B$2:$B$4")
+    return wb
+
+
+def test_resolve_range_uses_sheet_bounds_and_names():
+    wb = sales_workbook()
+    summary, sales = wb["Summary"], wb["Q1 Sales"]
+
+    ws, ref = resolve_range(summary, "'Q1 Sales'!B:C")
+    assert ws is sales and ref == RangeRef("Q1 Sales", 1, 4, 2, 3)
+    assert resolve_range(sales, "2:3")[1] == RangeRef(None, 2, 3, 1, 3)
+
+    ws, ref = resolve_range(summary, "revenue")
+    assert ws is sales and ref == RangeRef("Q1 Sales", 1, 4, 1, 3)
+    assert resolve_range(sales, "North")[1] == RangeRef("Q1 Sales", 2, 4, 2, 2)
+
+    for text in ("Missing!A1", "Nope", "North"):
+        with pytest.raises(ValueError):
+            resolve_range(summary, text)
+
+
+def test_tools_accept_extended_references(output_dir):
+    sales_workbook().save(output_dir / "sales.xlsx")
+
+    call_tool(main.format_excel_cells, "sales.xlsx", "'Q1 Sales'!B:C", {"bold": True})
+    call_tool(main.format_excel_cells, "sales.xlsx", "A1", {"bold": True}, "Q1 Sales")
+    call_tool(main.create_excel_chart, "sales.xlsx", "line", "Revenue")
+    main.workbook_cache.flush()
+
+    wb = load_workbook(output_dir / "sales.xlsx")
+    ws = wb["Q1 Sales"]
+    # Whole columns stop at the data instead of creating cells below it
+    assert ws.max_row == 4
+    assert all(ws.cell(row, 2).font.bold for row in range(1, 5))
+    assert ws["A1"].font.bold and not ws["A2"].font.bold
+    # The chart is added to the selected sheet, over the named range's data
+    chart = wb["Summary"]._charts[0]
+    refs = [series.val.numRef.f for series in chart.series if series.val]
+    assert refs and all(ref.startswith("'Q1 Sales'!$") for ref in refs)
+    assert any(ref.endswith("$4") for ref in refs)
+
+    with pytest.raises(Exception, match="Unknown defined name"):
+        call_tool(main.create_excel_chart, "sales.xlsx", "bar", "Profit")
@@ -0,0 +1,43 @@
+"""Shared pytest fixtures for the Exel MCP server tests."""
+
+import asyncio
+import inspect
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import main  # noqa: E402
+
+
+def call_tool(tool, *args, **kwargs):
+    """Call an @app.tool() function directly, bypassing the MCP transport."""
+    result = getattr(tool, "fn", tool)(*args, **kwargs)
+    if inspect.isawaitable(result):
+        # Offloaded tools are coroutines that run the body on the tool pool
+        result = asyncio.run(result)
+    return result
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    """Point the server's OUTPUT_DIR at a temporary directory with fresh caches."""
+    monkeypatch.setattr(main, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "metadata_cache", main.MetadataCache(16))
+    path_locks = main.PathLockManager()
+    monkeypatch.setattr(main, "path_locks", path_locks)
+    workbook_cache = main.WorkbookCache(
+        64 * 1024 * 1024,
+        60.0,
+        loader=main.workbook_cache.loader,
+        saver=main.save_workbook,
+        locks=path_locks,
+    )
+    monkeypatch.setattr(main, "workbook_cache", workbook_cache)
+    job_manager = main.JobManager(1, 4, 16)
+    monkeypatch.setattr(main, "job_manager", job_manager)
+    yield tmp_path
+    job_manager.shutdown()
+    workbook_cache.flush()
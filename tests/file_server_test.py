@@ -0,0 +1,276 @@
+"""Tests for the download server (FileHandler / FileServer) in src/main.py."""
+
+import gzip
+import os
+import socket
+import threading
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+
+import pytest
+
+import main
+
+
+@contextmanager
+def serve(max_workers):
+    server = main.FileServer(("127.0.0.1", 0), main.FileHandler, max_workers)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def file_server(output_dir):
+    """Run the download server on a free port for the duration of a test."""
+    with serve(max_workers=4) as url:
+        yield url
+
+
+def test_download_streams_file(output_dir, file_server):
+    payload = bytes(range(256)) * 4096
+    (output_dir / "data.xlsx").write_bytes(payload)
+
+    with urllib.request.urlopen(f"{file_server}/files/data.xlsx") as response:
+        assert response.status == 200
+        assert response.headers["Content-Length"] == str(len(payload))
+        assert "attachment" in response.headers["Content-Disposition"]
+        assert response.read() == payload
+
+    head = urllib.request.Request(f"{file_server}/files/data.xlsx", method="HEAD")
+    with urllib.request.urlopen(head) as response:
+        assert response.headers["Content-Length"] == str(len(payload))
+        assert response.read() == b""
+
+
+def test_download_errors(output_dir, file_server):
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        urllib.request.urlopen(f"{file_server}/files/missing.xlsx")
+    assert excinfo.value.code == 404
+
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        urllib.request.urlopen(f"{file_server}/other")
+    assert excinfo.value.code == 404
+
+
+def test_slow_client_does_not_block_other_downloads(output_dir, file_server):
+    (output_dir / "small.xlsx").write_bytes(b"x" * 10)
+    host, port = file_server.rsplit(":", 1)
+
+    # A client that never finishes its request line holds one worker
+    stalled = socket.create_connection((host.replace("http://", ""), int(port)))
+    stalled.sendall(b"GET /files/small.xlsx HTTP/1.1\r\n")
+    try:
+        with urllib.request.urlopen(
+            f"{file_server}/files/small.xlsx", timeout=5
+        ) as response:
+            assert response.read() == b"x" * 10
+    finally:
+        stalled.close()
+
+
+def test_stalled_connection_is_dropped(output_dir, monkeypatch):
+    (output_dir / "small.xlsx").write_bytes(b"x" * 10)
+    monkeypatch.setattr(main.FileHandler, "timeout", 0.5)
+
+    with serve(max_workers=1) as url:
+        port = int(url.rsplit(":", 1)[1])
+        stalled = socket.create_connection(("127.0.0.1", port))
+        stalled.sendall(b"GET /files/small.xlsx HTTP/1.1\r\n")
+        try:
+            # The only worker is held by the stalled client until it times out
+            with urllib.request.urlopen(f"{url}/files/small.xlsx", timeout=5) as r:
+                assert r.read() == b"x" * 10
+            stalled.settimeout(5)
+            assert stalled.recv(1) == b""
+        finally:
+            stalled.close()
+
+
+def _get(url, **headers):
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        return urllib.request.urlopen(request)
+    except urllib.error.HTTPError as e:
+        return e
+
+
+def test_range_requests(output_dir, file_server):
+    (output_dir / "range.xlsx").write_bytes(b"0123456789")
+    url = f"{file_server}/files/range.xlsx"
+
+    response = _get(url, Range="bytes=2-5")
+    assert response.status == 206
+    assert response.headers["Content-Range"] == "bytes 2-5/10"
+    assert response.read() == b"2345"
+
+    assert _get(url, Range="bytes=-3").read() == b"789"
+    assert _get(url, Range="bytes=7-").read() == b"789"
+    assert _get(url, Range="bytes=0-1,4-5").status == 200
+    assert _get(url, Range="bytes=20-").status == 416
+
+    # A stale If-Range validator means the full file is sent
+    response = _get(url, Range="bytes=2-5", **{"If-Range": '"stale"'})
+    assert response.status == 200
+    assert response.read() == b"0123456789"
+
+
+def test_conditional_get(output_dir, file_server):
+    (output_dir / "cond.xlsx").write_bytes(b"content")
+    url = f"{file_server}/files/cond.xlsx"
+
+    response = _get(url)
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+    assert response.headers["Accept-Ranges"] == "bytes"
+
+    assert _get(url, **{"If-None-Match": etag}).status == 304
+    assert _get(url, **{"If-None-Match": '"other"'}).status == 200
+    assert _get(url, **{"If-Modified-Since": last_modified}).status == 304
+
+    range_response = _get(url, Range="bytes=0-2", **{"If-Range": etag})
+    assert range_response.status == 206
+
+
+def test_gzip_downloads(output_dir, file_server):
+    payload = b"id,name\n" + b"".join(b"%d,row %d\n" % (i, i) for i in range(2000))
+    csv_path = output_dir / "data.csv"
+    csv_path.write_bytes(payload)
+    url = f"{file_server}/files/data.csv"
+
+    # No precompressed copy: compressed on the fly with a weak ETag
+    response = _get(url, **{"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"].startswith("W/")
+    assert gzip.decompress(response.read()) == payload
+
+    # A fresh .gz copy is sent as-is, with ranges and its own ETag
+    (output_dir / "data.csv.gz").write_bytes(gzip.compress(payload))
+    response = _get(url, **{"Accept-Encoding": "br, gzip;q=0.5"})
+    body = response.read()
+    assert response.headers["Content-Length"] == str(len(body))
+    assert gzip.decompress(body) == payload
+    gzip_etag = response.headers["ETag"]
+    assert _get(url, Range="bytes=0-1", **{"Accept-Encoding": "gzip"}).read() == (
+        body[:2]
+    )
+
+    identity = _get(url, **{"Accept-Encoding": "gzip;q=0"})
+    assert identity.headers["Content-Encoding"] is None
+    assert identity.headers["ETag"] != gzip_etag
+    assert identity.read() == payload
+
+    # A .gz copy older than the CSV is ignored
+    stat = csv_path.stat()
+    os.utime(output_dir / "data.csv.gz", ns=(stat.st_atime_ns, stat.st_mtime_ns - 1))
+    response = _get(url, **{"Accept-Encoding": "gzip"})
+    assert response.headers["ETag"].startswith("W/")
+    assert gzip.decompress(response.read()) == payload
+
+    # Already-compressed formats are never re-encoded
+    (output_dir / "book.xlsx").write_bytes(b"xlsx")
+    response = _get(f"{file_server}/files/book.xlsx", **{"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] is None
+
+
+def test_metrics_endpoint(output_dir, file_server):
+    from conftest import call_tool
+
+    calls_before = main.metrics.value("tool_calls_total", tool="create_excel_file")
+    call_tool(main.create_excel_file, "metrics.xlsx", ["A", "B"], [[1, 2], [3, 4]])
+    call_tool(main.format_excel_cells, "metrics.xlsx", "A1:B1", {"bold": True})
+    with pytest.raises(Exception):
+        call_tool(main.format_excel_cells, "missing.xlsx", "A1", {"bold": True})
+    _get(f"{file_server}/files/metrics.xlsx").read()
+
+    response = _get(f"{file_server}/metrics")
+    assert response.status == 200
+    assert response.headers["Content-Type"].startswith("text/plain")
+    text = response.read().decode()
+
+    assert main.metrics.value("tool_calls_total", tool="create_excel_file") == (
+        (calls_before or 0) + 1
+    )
+    for line in (
+        "# TYPE excel_mcp_tool_duration_seconds histogram",
+        'excel_mcp_tool_errors_total{tool="format_excel_cells"}',
+        'excel_mcp_tool_phase_seconds_count{phase="validation",tool="create_excel_file"}',
+        'excel_mcp_tool_phase_seconds_count{phase="save",tool="create_excel_file"}',
+        'excel_mcp_tool_phase_seconds_count{phase="load",tool="format_excel_cells"}',
+        'excel_mcp_tool_phase_seconds_count{phase="mutate",tool="format_excel_cells"}',
+        'excel_mcp_rows_written_total{tool="create_excel_file"}',
+        'excel_mcp_cells_written_total{tool="create_excel_file"}',
+        'excel_mcp_output_bytes_total{tool="create_excel_file"}',
+        'excel_mcp_downloads_total{encoding="identity"}',
+        "excel_mcp_download_bytes_total ",
+        'excel_mcp_http_responses_total{code="200"}',
+        "excel_mcp_workbook_cache_loads_total ",
+        'excel_mcp_file_lock_acquired_total{mode="write"}',
+    ):
+        assert line in text, line
+
+
+def test_memory_admin_endpoint(output_dir, file_server, monkeypatch):
+    import json
+    import tracemalloc
+
+    from conftest import call_tool
+
+    def admin(path, method="GET", token="secret"):
+        request = urllib.request.Request(
+            f"{file_server}{path}",
+            method=method,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        try:
+            response = urllib.request.urlopen(request)
+        except urllib.error.HTTPError as e:
+            response = e
+        body = response.read()
+        is_json = response.headers["Content-Type"] == "application/json"
+        return response.status, json.loads(body) if is_json else body
+
+    # Disabled unless ADMIN_TOKEN is set
+    assert admin("/admin/memory")[0] == 404
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "secret")
+    assert admin("/admin/memory", token="wrong")[0] == 401
+
+    try:
+        status, body = admin("/admin/memory/start?frames=5", "POST")
+        assert status == 200 and body["tracing"] and body["frames"] == 5
+        status, first = admin("/admin/memory/snapshots?label=before", "POST")
+        assert status == 200 and first["label"] == "before" and first["top"]
+
+        rows = [[f"row {i}", i] for i in range(500)]
+        call_tool(main.create_excel_file, "memory.xlsx", ["Name", "Value"], rows)
+
+        _, second = admin("/admin/memory/snapshots?label=after", "POST")
+        status, diff = admin(
+            f"/admin/memory/diff?from={first['id']}&to={second['id']}&limit=5"
+        )
+        assert status == 200 and len(diff) <= 5
+        assert {"site", "line", "size_diff_bytes", "count_diff"} <= set(diff[0])
+
+        status, top = admin("/admin/memory/top?group_by=traceback&limit=3")
+        assert status == 200 and len(top[0]["traceback"]) >= 1
+
+        _, body = admin("/admin/memory")
+        tool = body["tools"]["create_excel_file"]
+        assert tool["calls"] == 1 and tool["peak_bytes"] > 0
+        assert [s["label"] for s in body["snapshots"]] == ["before", "after"]
+        text = _get(f"{file_server}/metrics").read().decode()
+        assert 'excel_mcp_tool_peak_memory_bytes{tool="create_excel_file"}' in text
+
+        assert admin("/admin/memory/diff")[0] == 400
+        assert admin("/admin/memory/diff?from=999")[0] == 400
+        assert admin("/admin/memory/top?group_by=nope")[0] == 400
+        assert admin("/admin/memory/start", "GET")[0] == 404
+    finally:
+        admin("/admin/memory/stop", "POST")
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,107 @@
+"""Tests for per-file read/write locking (src/path_locks.py)."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from openpyxl import Workbook, load_workbook
+
+import main
+from conftest import call_tool
+from path_locks import PathLockManager
+
+
+def test_readers_share_and_writers_exclude(tmp_path):
+    locks = PathLockManager()
+    path = str(tmp_path / "a.xlsx")
+    events = []
+
+    def read(name, hold):
+        with locks.read(path):
+            events.append(f"{name} start")
+            time.sleep(hold)
+            events.append(f"{name} end")
+
+    def write():
+        with locks.write(path):
+            events.append("writer start")
+            # Reentrant: a writer may flush/read the same file again
+            with locks.read(path), locks.write(path):
+                pass
+            events.append("writer end")
+
+    with ThreadPoolExecutor(4) as pool:
+        readers = [pool.submit(read, f"r{i}", 0.2) for i in range(2)]
+        time.sleep(0.05)
+        writer = pool.submit(write)
+        time.sleep(0.05)
+        # A reader arriving while the writer waits queues behind it
+        late = pool.submit(read, "late", 0)
+        for future in readers + [writer, late]:
+            future.result(5)
+
+    assert set(events[:2]) == {"r0 start", "r1 start"}
+    writer_start = events.index("writer start")
+    assert writer_start > max(events.index("r0 end"), events.index("r1 end"))
+    assert events.index("late start") > events.index("writer end")
+
+    # A different file is never blocked
+    with locks.write(path):
+        with locks.try_write(str(tmp_path / "b.xlsx")) as locked:
+            assert locked
+        blocked = []
+
+        def try_write():
+            with locks.try_write(path) as locked:
+                blocked.append(locked)
+
+        thread = threading.Thread(target=try_write)
+        thread.start()
+        thread.join()
+        assert blocked == [False]
+
+    stats = locks.stats()
+    assert stats["write"]["contended"] >= 1
+    assert stats["write"]["wait_seconds"] > 0
+    assert stats["locks"]["active"] == 0
+
+
+def test_concurrent_edits_without_cache_keep_both_changes(output_dir, monkeypatch):
+    # With caching disabled every call loads and saves the file itself
+    monkeypatch.setattr(
+        main,
+        "workbook_cache",
+        main.WorkbookCache(
+            0, 0, main.load_workbook, main.save_workbook, main.path_locks
+        ),
+    )
+    wb = Workbook()
+    for row in range(1, 400):
+        wb.active.append([f"label {row}", row])
+    wb.save(output_dir / "shared.xlsx")
+
+    with ThreadPoolExecutor(2) as pool:
+        futures = [
+            pool.submit(
+                call_tool,
+                main.format_excel_cells,
+                "shared.xlsx",
+                "A1:B399",
+                {"bold": True},
+            ),
+            pool.submit(
+                call_tool,
+                main.create_excel_chart,
+                "shared.xlsx",
+                "bar",
+                "B1:B399",
+                "Values",
+            ),
+        ]
+        for future in futures:
+            future.result(30)
+
+    ws = load_workbook(output_dir / "shared.xlsx").active
+    assert ws["A1"].font.b
+    assert len(ws._charts) == 1
+    assert main.path_locks.stats()["write"]["acquired"] >= 2
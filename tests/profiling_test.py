@@ -0,0 +1,44 @@
+"""Tests for opt-in tool profiling (src/profiling.py)."""
+
+import pstats
+
+from openpyxl import Workbook
+
+import main
+from conftest import call_tool
+
+
+def test_profiles_sampled_tool_calls(output_dir, tmp_path, monkeypatch):
+    profiles = tmp_path / "profiles"
+    # The tool wrappers are bound to main.profiler, so configure it in place
+    monkeypatch.setattr(main.profiler, "directory", str(profiles))
+    monkeypatch.setattr(main.profiler, "tools", {"format_excel_cells"})
+    monkeypatch.setattr(main.profiler, "formats", ("prof", "collapsed"))
+    monkeypatch.setattr(main.profiler, "interval", 0.001)
+
+    wb = Workbook()
+    for row in range(1, 2001):
+        wb.active.append([f"label {row}", row])
+    wb.save(output_dir / "report.xlsx")
+
+    call_tool(main.get_excel_info, "report.xlsx")
+    assert not profiles.exists()
+
+    call_tool(main.format_excel_cells, "report.xlsx", "A1:B2000", {"bold": True})
+    prof = list(profiles.glob("format_excel_cells-*ms-*.prof"))
+    collapsed = list(profiles.glob("format_excel_cells-*ms-*.collapsed"))
+    assert len(prof) == 1 and len(collapsed) == 1
+
+    stats = pstats.Stats(str(prof[0]))
+    assert any(func[2] == "format_excel_cells" for func in stats.stats)
+    lines = collapsed[0].read_text().splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("main:format_excel_cells" in line for line in lines)
+
+    # Unsampled and too-fast calls leave no files behind
+    monkeypatch.setattr(main.profiler, "sample_rate", 0.0)
+    call_tool(main.format_excel_cells, "report.xlsx", "A1:A2", {"italic": True})
+    monkeypatch.setattr(main.profiler, "sample_rate", 1.0)
+    monkeypatch.setattr(main.profiler, "min_seconds", 3600)
+    call_tool(main.format_excel_cells, "report.xlsx", "A1:A2", {"italic": True})
+    assert len(list(profiles.iterdir())) == 2
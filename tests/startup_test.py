@@ -0,0 +1,23 @@
+"""Tests that importing src/main.py stays cheap."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+def test_import_does_not_load_openpyxl():
+    # A fresh interpreter: this test session has long since imported openpyxl
+    code = (
+        "import sys, main; "
+        "print(sorted(m for m in sys.modules if m.split('.')[0] == 'openpyxl'))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,109 @@
+"""Tests for running tool bodies off the event loop (src/tool_executor.py)."""
+
+import asyncio
+import threading
+
+import pytest
+from fastmcp import Client
+
+import main
+from tool_executor import ToolExecutor, parse_limits
+
+
+def test_parse_limits():
+    assert parse_limits(" create_excel_file=2, get_excel_info=8,") == {
+        "create_excel_file": 2,
+        "get_excel_info": 8,
+    }
+    with pytest.raises(ValueError):
+        parse_limits("create_excel_file")
+    with pytest.raises(ValueError):
+        parse_limits("create_excel_file=0")
+
+
+def test_per_tool_limit_does_not_block_other_tools():
+    executor = ToolExecutor(4, {"slow": 1})
+    release = threading.Event()
+
+    @executor.offload
+    def slow():
+        release.wait(5)
+        return "slow"
+
+    @executor.offload
+    def fast():
+        return threading.current_thread().name
+
+    async def scenario():
+        first = asyncio.ensure_future(slow())
+        second = asyncio.ensure_future(slow())
+        await asyncio.sleep(0.05)
+        # One slow call runs, the other waits for the limit; a different
+        # tool still gets a worker thread immediately
+        assert executor.stats()["running"] == {"slow": 1}
+        assert executor.stats()["waiting"] == {"slow": 1}
+        assert (await asyncio.wait_for(fast(), 1)).startswith("tool")
+        release.set()
+        return await asyncio.gather(first, second)
+
+    try:
+        assert asyncio.run(scenario()) == ["slow", "slow"]
+    finally:
+        executor.shutdown()
+
+
+def test_reserved_workers_keep_light_tools_responsive():
+    executor = ToolExecutor(4, {"write": 2}, light=["info"], reserved=1)
+    release = threading.Event()
+
+    @executor.offload
+    def write():
+        release.wait(5)
+
+    @executor.offload
+    def chart():
+        release.wait(5)
+
+    @executor.offload
+    def info():
+        return "info"
+
+    async def scenario():
+        # Enough heavy calls to fill the whole pool if nothing held one back
+        heavy = [asyncio.ensure_future(f()) for f in (write, write, chart, chart)]
+        await asyncio.sleep(0.05)
+        stats = executor.stats()
+        assert sum(stats["running"].values()) == 3
+        assert stats["waiting"] == {"chart": 1}
+        assert await asyncio.wait_for(info(), 1) == "info"
+        release.set()
+        await asyncio.gather(*heavy)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+
+def test_tools_run_off_the_event_loop(output_dir):
+    async def scenario():
+        async with Client(main.app) as client:
+            create = asyncio.ensure_future(
+                client.call_tool(
+                    "create_excel_file",
+                    {
+                        "filename": "big.xlsx",
+                        "headers": ["N", "Label"],
+                        "sheet_data": [[i, f"row {i}"] for i in range(9000)],
+                        "streaming": False,
+                    },
+                )
+            )
+            await asyncio.sleep(0.05)
+            await client.call_tool("flush_excel_changes", {})
+            # The quick call finished while the large create was still running
+            assert not create.done()
+            await create
+
+    asyncio.run(scenario())
+    assert (output_dir / "big.xlsx").exists()
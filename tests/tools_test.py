@@ -0,0 +1,600 @@
+"""Unit tests for the Exel MCP tool functions in src/main.py."""
+
+import gzip
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+import main
+from conftest import call_tool
+
+
+def test_create_excel_file_streaming_keeps_headers_and_styling(output_dir):
+    rows = [[f"item {i}", str(i)] for i in range(50)]
+    call_tool(
+        main.create_excel_file,
+        "stream.xlsx",
+        ["Name", "Value"],
+        rows,
+        sheet_name="Data",
+        formatting={"header_bold": True},
+        streaming=True,
+    )
+
+    wb = load_workbook(output_dir / "stream.xlsx")
+    ws = wb["Data"]
+    assert ws.max_row == 51
+    assert ws["A1"].value == "Name"
+    assert ws["A1"].font.bold
+    assert ws["A1"].alignment.horizontal == "center"
+    assert ws.column_dimensions["A"].width == len("item 49") + 2
+
+
+def test_create_excel_file_streaming_lifts_row_limit(output_dir, monkeypatch):
+    monkeypatch.setattr(main, "MAX_ROWS", 10)
+    monkeypatch.setattr(main, "STREAMING_THRESHOLD", 10)
+    rows = [[str(i)] for i in range(25)]
+
+    call_tool(main.create_excel_file, "big.xlsx", ["N"], rows)
+
+    wb = load_workbook(output_dir / "big.xlsx")
+    assert wb.active.max_row == 26
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_create_excel_file_rejects_bad_rows_while_writing(output_dir, streaming):
+    call_tool(main.create_excel_file, "rows.xlsx", ["A", "B"], [["old", "1"]])
+    # Pending edits to the existing file survive a failed overwrite
+    call_tool(main.format_excel_cells, "rows.xlsx", "A1:B1", {"bold": True})
+
+    good = [["x", 1]] * 20
+    for rows, message in (
+        (good + [["short"]] + good, "Row 21 has 1 columns, expected 2"),
+        (good + ["not a row"], "Row 21 is not an array"),
+        (good + [["x", {"nested": 1}]], "Row 21, column 2: unsupported value"),
+    ):
+        with pytest.raises(ValueError, match=message):
+            call_tool(
+                main.create_excel_file,
+                "rows.xlsx",
+                ["A", "B"],
+                rows,
+                formatting={"auto_width": True},
+                streaming=streaming,
+            )
+
+    main.workbook_cache.flush()
+    ws = load_workbook(output_dir / "rows.xlsx").active
+    assert ws["A2"].value == "old"
+    assert ws["A1"].font.bold
+
+
+def test_streaming_write_removes_its_temp_file_on_failure(output_dir, monkeypatch):
+    # openpyxl streams write-only rows into a file in the temp directory
+    scratch = output_dir / "scratch"
+    scratch.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(scratch))
+
+    with pytest.raises(ValueError, match="Row 3 has 1 columns"):
+        call_tool(
+            main.create_excel_file,
+            "rejected.xlsx",
+            ["A", "B"],
+            [["x", 1], ["y", 2], ["short"]],
+            streaming=True,
+        )
+    assert list(scratch.iterdir()) == []
+    assert not (output_dir / "rejected.xlsx").exists()
+
+
+def test_column_width_estimator_samples_rows():
+    estimator = main.ColumnWidthEstimator(2, expected_rows=100, sample_rows=10)
+    estimator.observe_header(["Id", "Description"])
+    for i in range(100):
+        # Only every 10th row is measured; row 5 is skipped by sampling
+        estimator.observe([str(i), "x" * 80 if i == 5 else "short"])
+
+    widths = estimator.widths()
+    assert widths == [len("99") + 2, len("Description") + 2]
+
+
+def test_create_excel_file_sets_widths_without_streaming(output_dir):
+    call_tool(
+        main.create_excel_file,
+        "widths.xlsx",
+        ["A", "Longer header"],
+        [["a much longer value", "x"]],
+        formatting={"auto_width": True},
+        streaming=False,
+    )
+
+    ws = load_workbook(output_dir / "widths.xlsx").active
+    assert ws.column_dimensions["A"].width == len("a much longer value") + 2
+    assert ws.column_dimensions["B"].width == len("Longer header") + 2
+    assert ws["B1"].font.bold
+
+
+def test_get_excel_info_reads_metadata_without_loading_cells(output_dir):
+    wb = Workbook()
+    wb.active.title = "First"
+    sales = wb.create_sheet("Q1 Sales")
+    sales["C5"] = 1
+    sales["E9"] = 2
+    wb.active = 1
+    wb.save(output_dir / "multi.xlsx")
+
+    info = call_tool(main.get_excel_info, "multi.xlsx")
+
+    assert info["sheets"] == ["First", "Q1 Sales"]
+    assert info["active_sheet"] == "Q1 Sales"
+    assert info["sheet_info"]["Q1 Sales"] == {
+        "dimensions": "C5:E9",
+        "max_row": 9,
+        "max_column": 5,
+    }
+    assert info["sheet_info"]["First"]["dimensions"] == "A1:A1"
+
+
+def test_get_excel_info_counts_rows_when_dimension_is_missing(output_dir):
+    # Write-only workbooks do not write a <dimension> element
+    rows = [["a", "b", "c"]] * 30
+    call_tool(
+        main.create_excel_file, "nodim.xlsx", ["X", "Y", "Z"], rows, streaming=True
+    )
+
+    info = call_tool(main.get_excel_info, "nodim.xlsx")
+
+    assert info["sheet_info"]["Sheet1"] == {
+        "dimensions": "A1:C31",
+        "max_row": 31,
+        "max_column": 3,
+    }
+
+
+def test_get_excel_info_cache_invalidates_on_rewrite(output_dir):
+    call_tool(main.create_excel_file, "cached.xlsx", ["A"], [["1"]])
+
+    call_tool(main.get_excel_info, "cached.xlsx")
+    call_tool(main.get_excel_info, "cached.xlsx")
+    assert main.metadata_cache.stats()["hits"] == 1
+    assert main.metadata_cache.stats()["misses"] == 1
+
+    call_tool(main.create_excel_file, "cached.xlsx", ["A"], [["1"], ["2"], ["3"]])
+    info = call_tool(main.get_excel_info, "cached.xlsx")
+    assert info["sheet_info"]["Sheet1"]["max_row"] == 4
+    assert main.metadata_cache.stats()["misses"] == 2
+
+
+def test_edits_are_coalesced_until_flush(output_dir):
+    rows = [["a", "1"], ["b", "2"], ["c", "3"]]
+    call_tool(main.create_excel_file, "report.xlsx", ["Name", "Qty"], rows)
+    mtime = (output_dir / "report.xlsx").stat().st_mtime_ns
+
+    call_tool(main.format_excel_cells, "report.xlsx", "A1:B1", {"bold": True})
+    call_tool(main.format_excel_cells, "report.xlsx", "A2:B4", {"italic": True})
+    call_tool(main.create_excel_chart, "report.xlsx", "bar", "A1:B4")
+
+    stats = main.workbook_cache.stats()
+    assert stats["loads"] == 1
+    assert stats["saves"] == 0
+    assert stats["dirty"] == 1
+    assert (output_dir / "report.xlsx").stat().st_mtime_ns == mtime
+
+    # Reading the file from disk writes the pending changes back first
+    call_tool(main.get_excel_info, "report.xlsx")
+    assert main.workbook_cache.stats()["saves"] == 1
+
+    ws = load_workbook(output_dir / "report.xlsx").active
+    assert ws["A1"].font.bold
+    assert ws["B4"].font.italic
+    assert len(ws._charts) == 1
+
+
+def test_apply_excel_operations_runs_in_one_transaction(output_dir):
+    call_tool(
+        main.create_excel_file, "batch.xlsx", ["Name", "Qty"], [["a", 1], ["b", 2]]
+    )
+
+    result = call_tool(
+        main.apply_excel_operations,
+        "batch.xlsx",
+        [
+            {"type": "rename_sheet", "sheet_name": "Sheet1", "new_name": "Data"},
+            {"type": "write_cells", "start_cell": "A4", "values": [["c", 3]]},
+            {"type": "format", "cell_range": "A1:B1", "formatting": {"bold": True}},
+            {"type": "chart", "chart_type": "line", "data_range": "A1:B4"},
+            {"type": "add_sheet", "sheet_name": "Notes"},
+        ],
+    )
+    assert "5 operations" in result
+    main.workbook_cache.flush()
+    assert main.workbook_cache.stats()["loads"] == 1
+    assert main.workbook_cache.stats()["saves"] == 1
+
+    wb = load_workbook(output_dir / "batch.xlsx")
+    assert wb.sheetnames == ["Data", "Notes"]
+    assert wb["Data"]["B4"].value == 3
+    assert wb["Data"]["A1"].font.bold
+
+
+def test_apply_excel_operations_rolls_back_on_failure(output_dir):
+    call_tool(main.create_excel_file, "rollback.xlsx", ["Name"], [["a"]])
+
+    with pytest.raises(Exception, match="Operation 2"):
+        call_tool(
+            main.apply_excel_operations,
+            "rollback.xlsx",
+            [
+                {"type": "write_cells", "values": [["changed"]]},
+                {"type": "rename_sheet", "sheet_name": "Missing", "new_name": "X"},
+            ],
+        )
+
+    main.workbook_cache.flush()
+    wb = load_workbook(output_dir / "rollback.xlsx")
+    assert wb.active["A1"].value == "Name"
+
+
+def test_format_excel_cells_interns_styles(output_dir):
+    call_tool(main.create_excel_file, "styles.xlsx", ["A", "B"], [["1", "2"]] * 5)
+    formatting = {
+        "bold": True,
+        "font_color": "ff0000",
+        "background_color": "FFFF00",
+        "alignment": "center",
+        "border": True,
+    }
+
+    call_tool(main.format_excel_cells, "styles.xlsx", "A1:C8", formatting)
+
+    assert main.resolve_style(formatting) is main.resolve_style(dict(formatting))
+    main.workbook_cache.flush()
+    ws = load_workbook(output_dir / "styles.xlsx").active
+    for cell in ("A1", "B6", "C8"):
+        assert ws[cell].font.bold
+        assert ws[cell].font.color.rgb == "00FF0000"
+        assert ws[cell].fill.fgColor.rgb == "00FFFF00"
+        assert ws[cell].alignment.horizontal == "center"
+        assert ws[cell].border.left.style == "thin"
+
+
+def test_import_csv_to_excel_streams_file_rows(output_dir):
+    csv_path = output_dir / "people.csv"
+    csv_path.write_text(
+        'name;notes\nAda;"multi\nline"\nGrace;short\n', encoding="utf-8"
+    )
+
+    call_tool(main.import_csv_to_excel, str(csv_path), "people.xlsx", delimiter=";")
+
+    ws = load_workbook(output_dir / "people.xlsx").active
+    assert [c.value for c in ws[1]] == ["name", "notes"]
+    assert ws["B2"].value == "multi\nline"
+    assert ws.max_row == 3
+    assert ws["A1"].font.bold
+
+
+def test_failed_import_keeps_pending_edits(output_dir):
+    call_tool(main.create_excel_file, "edited.xlsx", ["A"], [[1]])
+    call_tool(main.format_excel_cells, "edited.xlsx", "A1", {"bold": True})
+
+    empty_csv = output_dir / "empty.csv"
+    empty_csv.write_text("")
+    with pytest.raises(Exception, match="CSV file is empty"):
+        call_tool(main.import_csv_to_excel, str(empty_csv), "edited.xlsx")
+
+    main.workbook_cache.flush()
+    assert load_workbook(output_dir / "edited.xlsx").active["A1"].font.bold
+
+
+def test_import_csv_to_excel_without_headers(output_dir):
+    call_tool(
+        main.import_csv_to_excel, "1,2\n3,4\n", "noheaders.xlsx", has_headers=False
+    )
+
+    ws = load_workbook(output_dir / "noheaders.xlsx").active
+    assert [c.value for c in ws[1]] == ["Column 1", "Column 2"]
+    assert [c.value for c in ws[3]] == [3, 4]
+
+
+def test_export_excel_to_csv_streams_rows(output_dir):
+    rows = [["a", None, 1], ["b", "x", 2]]
+    call_tool(main.create_excel_file, "export.xlsx", ["Name", "Note", "N"], rows)
+    csv_path = output_dir / "export.csv"
+
+    call_tool(main.export_excel_to_csv, "export.xlsx", str(csv_path))
+    assert csv_path.read_text(encoding="utf-8").splitlines() == [
+        "Name,Note,N",
+        "a,,1",
+        "b,x,2",
+    ]
+
+    call_tool(
+        main.export_excel_to_csv,
+        "export.xlsx",
+        str(csv_path),
+        delimiter=";",
+        include_headers=False,
+    )
+    assert csv_path.read_text(encoding="utf-8").splitlines() == ["a;;1", "b;x;2"]
+
+    # A gzip copy for the download server is written in the same pass
+    gz_path = output_dir / "export.csv.gz"
+    assert gzip.decompress(gz_path.read_bytes()) == csv_path.read_bytes()
+    assert gz_path.stat().st_mtime_ns >= csv_path.stat().st_mtime_ns
+
+
+def test_export_excel_to_csv_exports_all_sheets_in_parallel(output_dir):
+    wb = Workbook()
+    wb.active.title = "Jan"
+    wb.active.append(["Day", "Sales"])
+    wb.active.append([1, 10])
+    feb = wb.create_sheet("Feb Sales")
+    feb.append(["Day", "Sales"])
+    feb.append([1, 20])
+    wb.save(output_dir / "months.xlsx")
+    csv_path = output_dir / "months.csv"
+
+    result = call_tool(
+        main.export_excel_to_csv,
+        "months.xlsx",
+        str(csv_path),
+        all_sheets=True,
+        max_workers=2,
+    )
+
+    assert "Jan: 2 rows" in result
+    assert (output_dir / "months_Jan.csv").read_text().splitlines()[1] == "1,10"
+    assert (output_dir / "months_Feb_Sales.csv").read_text().splitlines()[1] == "1,20"
+
+    call_tool(
+        main.export_excel_to_csv,
+        "months.xlsx",
+        str(csv_path),
+        sheet_names=["Feb Sales"],
+        zip_output=True,
+    )
+    with zipfile.ZipFile(output_dir / "months.zip") as archive:
+        assert archive.namelist() == ["months_Feb_Sales.csv"]
+    assert (output_dir / "months_Jan.csv.gz").exists()
+
+
+# Exports on the shared pool from a script run as __main__, like the server
+EXPORT_SCRIPT = """
+import sys
+
+sys.path.insert(0, sys.argv[1])
+print("script ran as", __name__, flush=True)
+import csv_export
+
+if __name__ == "__main__":
+    csv_export.skip_main_in_workers()
+    book, out = sys.argv[2], sys.argv[3]
+    for n in range(2):
+        paths = [f"{out}/{n}a.csv", f"{out}/{n}b.csv"]
+        csv_export.export_sheets(book, ["Sheet", "Two"], paths, max_workers=2)
+        print("pool", id(csv_export._pool), flush=True)
+"""
+
+
+def test_export_workers_do_not_rerun_the_main_script(tmp_path):
+    wb = Workbook()
+    wb.active.append(["a", 1])
+    wb.create_sheet("Two").append(["b", 2])
+    wb.save(tmp_path / "book.xlsx")
+    script = tmp_path / "server.py"
+    script.write_text(EXPORT_SCRIPT)
+
+    result = subprocess.run(
+        [
+            sys.executable,
+            str(script),
+            str(Path(main.__file__).parent),
+            str(tmp_path / "book.xlsx"),
+            str(tmp_path),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=120,
+    )
+
+    lines = result.stdout.splitlines()
+    assert [line for line in lines if line.startswith("script")] == [
+        "script ran as __main__"
+    ]
+    pools = [line for line in lines if line.startswith("pool")]
+    assert len(pools) == 2 and pools[0] == pools[1]
+    assert (tmp_path / "1b.csv").read_text().strip() == "b,2"
+
+
+def test_import_csv_to_excel_infers_column_types(output_dir, monkeypatch):
+    monkeypatch.setattr(main, "CSV_CHUNK_ROWS", 2)
+    csv_content = (
+        "id,zip,price,active,day\n"
+        "1,00123,9.5,true,2024-01-31\n"
+        "2,04101,,false,2024-02-01\n"
+        "3,94105,12,TRUE,2024-02-02\n"
+    )
+
+    call_tool(main.import_csv_to_excel, csv_content, "typed.xlsx")
+
+    ws = load_workbook(output_dir / "typed.xlsx").active
+    assert [c.value for c in ws[2]][:4] == [1, "00123", 9.5, True]
+    assert ws["C3"].value is None
+    assert ws["E2"].value.year == 2024 and ws["E2"].is_date
+    # The last row is in its own chunk, but column types carry over: the zip
+    # column stays text and the price column stays float
+    assert [c.value for c in ws[4]][:4] == [3, "94105", 12.0, True]
+
+    call_tool(main.import_csv_to_excel, "v\n1e400\n2\n", "huge.xlsx")
+    ws = load_workbook(output_dir / "huge.xlsx").active
+    assert [ws["A2"].value, ws["A3"].value] == ["1e400", "2"]
+
+    call_tool(main.import_csv_to_excel, csv_content, "text.xlsx", infer_types=False)
+    assert load_workbook(output_dir / "text.xlsx").active["A2"].value == "1"
+
+
+def _wait_for_job(job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while True:
+        status = call_tool(main.get_job_status, job_id)
+        if status["status"] not in ("queued", "running"):
+            return status
+        assert time.monotonic() < deadline, status
+        time.sleep(0.01)
+
+
+def test_async_jobs_report_progress_and_download_link(output_dir, monkeypatch):
+    monkeypatch.setattr(main, "PROGRESS_EVERY_ROWS", 10)
+    rows = [[i, f"row {i}"] for i in range(25)]
+
+    message = call_tool(
+        main.create_excel_file, "job.xlsx", ["N", "Label"], rows, run_async=True
+    )
+    job_id = message.split()[2]
+    status = _wait_for_job(job_id)
+
+    assert status["status"] == "succeeded"
+    assert status["progress"] == {
+        "rows": 25,
+        "bytes": (output_dir / "job.xlsx").stat().st_size,
+    }
+    assert status["download_url"].endswith("/files/job.xlsx")
+    assert load_workbook(output_dir / "job.xlsx").active.max_row == 26
+
+    # Failures are reported on the job rather than raised
+    message = call_tool(
+        main.create_excel_file,
+        "bad.xlsx",
+        ["A"],
+        [[1]],
+        sheet_name="a/b",
+        run_async=True,
+    )
+    status = _wait_for_job(message.split()[2])
+    assert status["status"] == "failed"
+    assert "Invalid character" in status["error"]
+    assert "download_url" not in status
+
+
+def test_polling_a_finished_job_is_not_counted_as_an_error(output_dir):
+    def errors():
+        return [
+            main.metrics.value("tool_errors_total", tool=tool) or 0
+            for tool in ("get_job_status", "cancel_job")
+        ]
+
+    before = errors()
+    message = call_tool(
+        main.create_excel_file, "polled.xlsx", ["A"], [[1]], run_async=True
+    )
+    job_id = message.split()[2]
+
+    # Job snapshots always carry an "error" key, which is None on success
+    status = _wait_for_job(job_id)
+    assert status["status"] == "succeeded" and status["error"] is None
+    call_tool(main.cancel_job, job_id)
+
+    assert errors() == before
+
+
+def test_cancel_job(output_dir):
+    release = threading.Event()
+    blocker = main.job_manager.submit("test", lambda job: release.wait(10) and "")
+    try:
+        message = call_tool(
+            main.create_excel_file, "queued.xlsx", ["A"], [[1]], run_async=True
+        )
+        job_id = message.split()[2]
+        assert call_tool(main.cancel_job, job_id)["status"] == "cancelled"
+    finally:
+        release.set()
+    assert _wait_for_job(blocker.id)["status"] == "succeeded"
+    assert not (output_dir / "queued.xlsx").exists()
+
+    # A running job stops at its next progress report
+    started = threading.Event()
+
+    def work(job):
+        started.set()
+        while True:
+            job.report(rows=1)
+            time.sleep(0.01)
+
+    running = main.job_manager.submit("test", work)
+    assert started.wait(5)
+    call_tool(main.cancel_job, running.id)
+    assert _wait_for_job(running.id)["status"] == "cancelled"
+
+    with pytest.raises(Exception, match="Unknown job"):
+        call_tool(main.get_job_status, "nope")
+
+
+def test_cancel_only_stops_jobs_before_the_file_is_saved(output_dir, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    real_append, real_save = main.append_rows, main.save_workbook
+
+    def cancel_after(real):
+        def wrapper(*args, **kwargs):
+            result = real(*args, **kwargs)
+            started.set()
+            assert release.wait(5)
+            return result
+
+        return wrapper
+
+    def run(filename, patched):
+        started.clear()
+        release.clear()
+        with monkeypatch.context() as m:
+            m.setattr(main, patched.__name__, cancel_after(patched))
+            message = call_tool(
+                main.create_excel_file, filename, ["A"], [[1]], run_async=True
+            )
+            assert started.wait(5)
+            job_id = message.split()[2]
+            call_tool(main.cancel_job, job_id)
+            release.set()
+            return _wait_for_job(job_id)
+
+    # Cancelled after the rows are written but before the save: no file
+    assert run("before.xlsx", real_append)["status"] == "cancelled"
+    assert not (output_dir / "before.xlsx").exists()
+
+    # Cancelled once the file is saved: too late, the job succeeds
+    status = run("after.xlsx", real_save)
+    assert status["status"] == "succeeded"
+    assert status["progress"]["bytes"] > 0
+    assert (output_dir / "after.xlsx").exists()
+
+
+def test_saves_replace_files_atomically(output_dir, monkeypatch):
+    call_tool(main.create_excel_file, "atomic.xlsx", ["A"], [[1]])
+    original = (output_dir / "atomic.xlsx").read_bytes()
+
+    def failing_save(self, filename):
+        with open(filename, "wb") as f:
+            f.write(b"PK partial")
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(Workbook, "save", failing_save)
+        with pytest.raises(Exception, match="disk full"):
+            call_tool(main.create_excel_file, "atomic.xlsx", ["A"], [[2]])
+
+    # The failed save left the previous file and no temporary files behind
+    assert (output_dir / "atomic.xlsx").read_bytes() == original
+    assert sorted(p.name for p in output_dir.iterdir()) == ["atomic.xlsx"]
+
+    # A reader that opened the file before a save keeps seeing the old file
+    with open(output_dir / "atomic.xlsx", "rb") as reader:
+        call_tool(main.create_excel_file, "atomic.xlsx", ["A"], [[3]])
+        assert reader.read() == original
+    assert load_workbook(output_dir / "atomic.xlsx").active["A2"].value == 3